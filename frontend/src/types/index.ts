@@ -33,6 +33,7 @@ export interface Repo {
   trend_status: 'new' | 'rising' | 'steady' | 'declining' | ''
   watchers: number
   open_issues: number
+  trending_pages?: string[]
 }
 
 export interface EventCluster {
@@ -43,6 +44,9 @@ export interface EventCluster {
   keywords: string[]
   tweet_ids: string[]
   repo_names: string[]
+  first_seen?: string | null
+  days_active?: number
+  total_heat?: number
 }
 
 export interface Quest {
@@ -99,5 +103,7 @@ export interface DailyData {
     degraded?: boolean
     degraded_modules?: string[]
     message?: string
+    http_cache?: Record<string, number>
+    source_latency?: Record<string, number>
   }
 }
@@ -1,32 +1,240 @@
 """GitHub 趋势数据采集"""
 
+import asyncio
 import json
-import re
 import logging
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import httpx
-from bs4 import BeautifulSoup
+
+from pipeline.collectors.http_cache import HttpCache, cached_get
+from pipeline.collectors.http_client import use_client
+from pipeline.collectors.rate_limit import RateLimitBudget
+from pipeline.collectors.trending_parser import get_parser
 
 logger = logging.getLogger(__name__)
 
 
+class RepoEnricher(ABC):
+    """用 GitHub API 补充 repo 详细信息（created_at / topics / 各项计数）"""
+
+    @abstractmethod
+    async def enrich(self, client: httpx.AsyncClient, repos: list[dict]) -> list[dict]:
+        ...
+
+    def _apply_repo_data(self, repo: dict, data: dict):
+        """data 为 REST /repos/{name} 格式"""
+        repo["created_at"] = data.get("created_at")
+        repo["topics"] = data.get("topics", [])
+        repo["description"] = data.get("description") or repo["description"]
+        repo["stars"] = data.get("stargazers_count", repo["stars"])
+        repo["forks"] = data.get("forks_count", repo["forks"])
+        repo["watchers"] = data.get("subscribers_count", 0)
+        repo["open_issues"] = data.get("open_issues_count", 0)
+
+
+class RestEnricher(RepoEnricher):
+    """REST 逐个请求 /repos/{name}（并发、限流感知）
+
+    前 enrich_limit 个 repo 总会尝试；额度富余时继续补充其余 repo。
+    """
+
+    def __init__(self, api_base: str, headers: dict, concurrency: int = 8, enrich_limit: int = 20,
+                 http_cache: HttpCache | None = None):
+        self.api_base = api_base
+        self.headers = headers
+        self.concurrency = concurrency
+        self.enrich_limit = enrich_limit
+        self.http_cache = http_cache
+
+    async def enrich(self, client: httpx.AsyncClient, repos: list[dict]) -> list[dict]:
+        budget = RateLimitBudget(max_concurrency=self.concurrency)
+        await asyncio.gather(*(
+            self._enrich_one(client, repo, budget, overflow=i >= self.enrich_limit)
+            for i, repo in enumerate(repos)
+        ))
+        logger.info(
+            f"GitHub REST enrichment: {budget.stats['requests']} requests, "
+            f"{budget.stats['rate_limited']} rate limited, {budget.stats['skipped']} skipped, "
+            f"remaining={budget.remaining}"
+        )
+        return repos
+
+    async def _enrich_one(self, client: httpx.AsyncClient, repo: dict, budget: RateLimitBudget, overflow: bool):
+        for _ in range(2):  # 限流暂停后重试一次
+            if not await budget.acquire(overflow=overflow):
+                return
+            resp = None
+            try:
+                resp = await cached_get(
+                    client, f"{self.api_base}/repos/{repo['name']}", self.http_cache, headers=self.headers
+                )
+            except Exception as e:
+                logger.debug(f"API enrich failed for {repo['name']}: {e}")
+            if await budget.release(resp):
+                continue
+            if resp is not None and resp.status_code == 200:
+                try:
+                    self._apply_repo_data(repo, resp.json())
+                except Exception as e:  # 200 但响应体不是预期的 JSON（如 HTML 错误页）
+                    logger.debug(f"API enrich failed for {repo['name']}: {e}")
+            return
+
+
+class GraphQLEnricher(RepoEnricher):
+    """GraphQL 别名批量查询：一次请求补充 batch_size 个 repo
+
+    整批失败（网络错误 / 非 200 / 顶层报错无数据）的 repo 交给 fallback（REST）处理。
+    """
+
+    REPO_FIELDS = """
+    fragment RepoFields on Repository {
+        createdAt
+        description
+        stargazerCount
+        forkCount
+        watchers { totalCount }
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+    }
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        headers: dict,
+        concurrency: int = 4,
+        batch_size: int = 50,
+        fallback: RepoEnricher | None = None,
+    ):
+        self.graphql_url = f"{api_base}/graphql"
+        self.headers = headers
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.fallback = fallback
+
+    async def enrich(self, client: httpx.AsyncClient, repos: list[dict]) -> list[dict]:
+        budget = RateLimitBudget(max_concurrency=self.concurrency)
+        batches = [repos[i:i + self.batch_size] for i in range(0, len(repos), self.batch_size)]
+        results = await asyncio.gather(*(self._enrich_batch(client, b, budget) for b in batches))
+
+        failed = [repo for batch, ok in zip(batches, results) if not ok for repo in batch]
+        logger.info(
+            f"GitHub GraphQL enrichment: {len(batches)} queries for {len(repos)} repos, "
+            f"{len(failed)} repos failed, remaining={budget.remaining}"
+        )
+        if failed and self.fallback:
+            await self.fallback.enrich(client, failed)
+        return repos
+
+    async def _enrich_batch(self, client: httpx.AsyncClient, batch: list[dict], budget: RateLimitBudget) -> bool:
+        query, variables = self._build_query(batch)
+        for _ in range(2):  # 限流暂停后重试一次
+            if not await budget.acquire():
+                return False
+            resp = None
+            try:
+                resp = await client.post(
+                    self.graphql_url, headers=self.headers, json={"query": query, "variables": variables}
+                )
+            except Exception as e:
+                logger.debug(f"GraphQL enrich failed: {e}")
+            if await budget.release(resp):
+                continue
+            if resp is None or resp.status_code != 200:
+                return False
+            try:
+                body = resp.json()
+            except ValueError as e:  # 200 但不是 JSON（如 HTML 错误页），整批交给 REST
+                logger.debug(f"GraphQL enrich failed: {e}")
+                return False
+            data = body.get("data") if isinstance(body, dict) else None
+            if not data:
+                logger.debug(f"GraphQL enrich errors: {body.get('errors') if isinstance(body, dict) else body}")
+                return False
+            for i, repo in enumerate(batch):
+                node = data.get(f"r{i}")
+                if node:  # 仓库不存在/已改名时为 null，REST 也拿不到，直接跳过
+                    self._apply_repo_data(repo, self._to_rest(node))
+            return True
+        return False
+
+    def _build_query(self, batch: list[dict]) -> tuple[str, dict]:
+        """用变量传 owner/name，避免拼接进查询字符串"""
+        params, fields, variables = [], [], {}
+        for i, repo in enumerate(batch):
+            owner, name = repo["name"].split("/", 1)
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+        query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}" + self.REPO_FIELDS
+        return query, variables
+
+    def _to_rest(self, node: dict) -> dict:
+        """GraphQL 字段映射为 REST 字段（REST 的 open_issues_count 含 PR）"""
+        return {
+            "created_at": node.get("createdAt"),
+            "topics": [
+                n["topic"]["name"]
+                for n in (node.get("repositoryTopics") or {}).get("nodes", [])
+            ],
+            "description": node.get("description"),
+            "stargazers_count": node.get("stargazerCount"),
+            "forks_count": node.get("forkCount"),
+            "subscribers_count": (node.get("watchers") or {}).get("totalCount", 0),
+            "open_issues_count": (
+                (node.get("issues") or {}).get("totalCount", 0)
+                + (node.get("pullRequests") or {}).get("totalCount", 0)
+            ),
+        }
+
+
 class GitHubCollector:
 
     TRENDING_URL = "https://github.com/trending"
     API_BASE = "https://api.github.com"
 
-    def __init__(self, config):
+    def __init__(self, config, http_cache: HttpCache | None = None, client: httpx.AsyncClient | None = None,
+                 now: datetime | None = None):
+        """now: 本次运行时间（回放时固定为录制当天），决定快照文件的日期"""
+        self.http_cache = http_cache
+        self.client = client
+        self.now = now
         self.token = config.github_token
         self.headers = {"Accept": "application/vnd.github.v3+json"}
         if self.token:
             self.headers["Authorization"] = f"token {self.token}"
+        self.trending_languages = config.github_trending_languages
+        self.trending_periods = config.github_trending_periods
+        self.parser = get_parser(config.github_trending_parser)
+        self.enricher = self._build_enricher(config)
         self.data_dir = Path(config.data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+    def _build_enricher(self, config) -> "RepoEnricher":
+        rest = RestEnricher(
+            self.API_BASE,
+            self.headers,
+            concurrency=config.github_api_concurrency,
+            enrich_limit=config.github_enrich_limit,
+            http_cache=self.http_cache,
+        )
+        # GraphQL API 必须带 token，否则只能走 REST
+        if config.github_enrich_backend == "graphql" and self.token:
+            return GraphQLEnricher(
+                self.API_BASE,
+                self.headers,
+                concurrency=config.github_api_concurrency,
+                fallback=rest,
+            )
+        return rest
+
     async def collect(self) -> dict:
-        async with httpx.AsyncClient(timeout=30, headers=self.headers) as client:
+        async with use_client(self.client, timeout=30) as client:
             trending = await self._scrape_trending(client)
             detailed = await self._enrich_with_api(client, trending)
 
@@ -41,107 +249,46 @@ class GitHubCollector:
             }
 
     async def _scrape_trending(self, client: httpx.AsyncClient) -> list[dict]:
-        """解析 github.com/trending 页面"""
-        repos = []
-        for lang in ["", "python", "typescript", "rust"]:
-            url = f"{self.TRENDING_URL}/{lang}?since=daily" if lang else f"{self.TRENDING_URL}?since=daily"
-            try:
-                resp = await client.get(url)
-                resp.raise_for_status()
-                page_repos = self._parse_trending_page(resp.text)
-                repos.extend(page_repos)
-            except Exception as e:
-                logger.warning(f"Failed to scrape trending/{lang}: {e}")
+        """并发抓取 语言 × 周期 的 trending 页面，合并去重"""
+        pages = [
+            (lang, period)
+            for period in self.trending_periods
+            for lang in self.trending_languages
+        ]
+        results = await asyncio.gather(*(
+            self._fetch_trending_page(client, lang, period) for lang, period in pages
+        ))
 
-        # 去重
-        seen = set()
-        unique = []
-        for r in repos:
-            if r["name"] not in seen:
-                seen.add(r["name"])
-                unique.append(r)
-        return unique
+        # 按页面顺序合并去重，记录每个 repo 出现在哪些页面
+        merged: dict[str, dict] = {}
+        for (lang, period), page_repos in zip(pages, results):
+            page = f"{lang or 'all'}/{period}"
+            for r in page_repos:
+                # 页面上的 "stars today / this week / this month" 对应该周期涨星，只有日榜的算 24h
+                period_stars = r.pop("stars_24h")
+                repo = merged.setdefault(r["name"], {**r, "stars_24h": 0, "trending_pages": []})
+                repo["trending_pages"].append(page)
+                if period == "daily" and not repo["stars_24h"]:
+                    repo["stars_24h"] = period_stars
+        return list(merged.values())
+
+    async def _fetch_trending_page(self, client: httpx.AsyncClient, lang: str, period: str) -> list[dict]:
+        url = f"{self.TRENDING_URL}/{lang}" if lang else self.TRENDING_URL
+        try:
+            resp = await cached_get(client, url, self.http_cache, params={"since": period})
+            resp.raise_for_status()
+            return self._parse_trending_page(resp.text)
+        except Exception as e:
+            logger.warning(f"Failed to scrape trending/{lang}?since={period}: {e}")
+            return []
 
     def _parse_trending_page(self, html: str) -> list[dict]:
         """解析 trending 页面 HTML"""
-        soup = BeautifulSoup(html, "lxml")
-        repos = []
-
-        for article in soup.select("article.Box-row"):
-            try:
-                h2 = article.select_one("h2 a")
-                if not h2:
-                    continue
-                full_name = h2.get("href", "").strip("/")
-                if "/" not in full_name:
-                    continue
-                owner, name = full_name.split("/", 1)
-
-                desc_el = article.select_one("p")
-                description = desc_el.get_text(strip=True) if desc_el else ""
-
-                lang_el = article.select_one("[itemprop='programmingLanguage']")
-                language = lang_el.get_text(strip=True) if lang_el else ""
-
-                stars_el = article.select("a.Link--muted")
-                stars = 0
-                forks = 0
-                if len(stars_el) >= 1:
-                    stars = self._parse_number(stars_el[0].get_text(strip=True))
-                if len(stars_el) >= 2:
-                    forks = self._parse_number(stars_el[1].get_text(strip=True))
-
-                stars_today_el = article.select_one("span.d-inline-block.float-sm-right")
-                stars_24h = 0
-                if stars_today_el:
-                    match = re.search(r"([\d,]+)", stars_today_el.get_text())
-                    if match:
-                        stars_24h = int(match.group(1).replace(",", ""))
-
-                repos.append({
-                    "name": full_name,
-                    "owner": owner,
-                    "description": description,
-                    "stars": stars,
-                    "forks": forks,
-                    "stars_24h": stars_24h,
-                    "language": language,
-                    "created_at": None,
-                    "topics": [],
-                    "readme_summary": "",
-                    "watchers": 0,
-                    "open_issues": 0,
-                })
-            except Exception as e:
-                logger.debug(f"Parse error for article: {e}")
-                continue
-
-        return repos
+        return self.parser.parse(html)
 
     async def _enrich_with_api(self, client: httpx.AsyncClient, repos: list[dict]) -> list[dict]:
         """用 GitHub API 补充详细信息"""
-        enriched = []
-        for repo in repos[:20]:
-            try:
-                resp = await client.get(f"{self.API_BASE}/repos/{repo['name']}")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    repo["created_at"] = data.get("created_at")
-                    repo["topics"] = data.get("topics", [])
-                    repo["description"] = data.get("description") or repo["description"]
-                    repo["stars"] = data.get("stargazers_count", repo["stars"])
-                    repo["forks"] = data.get("forks_count", repo["forks"])
-                    repo["watchers"] = data.get("subscribers_count", 0)
-                    repo["open_issues"] = data.get("open_issues_count", 0)
-                elif resp.status_code == 403:
-                    logger.warning("GitHub API rate limited, skipping enrichment")
-                    break
-            except Exception as e:
-                logger.debug(f"API enrich failed for {repo['name']}: {e}")
-            enriched.append(repo)
-
-        enriched.extend(repos[20:])
-        return enriched
+        return await self.enricher.enrich(client, repos)
 
     def _compare_with_history(self, repos: list[dict]) -> list[dict]:
         """与昨日快照对比，计算连续在榜天数和趋势状态"""
@@ -156,9 +303,11 @@ class GitHubCollector:
             if name in yesterday_map:
                 prev = yesterday_map[name]
                 repo["trending_days"] = prev.get("trending_days", 1) + 1
-                # 判断增长加速还是减速
+                # 判断增长加速还是减速；今天或昨天只上了周榜 / 月榜的没有 24h 涨星，不比较
                 prev_stars_24h = prev.get("stars_24h", 0)
-                if repo["stars_24h"] > prev_stars_24h * 1.2:
+                if not _on_daily(repo) or prev_stars_24h is None:
+                    repo["trend_status"] = ""
+                elif repo["stars_24h"] > prev_stars_24h * 1.2:
                     repo["trend_status"] = "rising"
                 elif repo["stars_24h"] < prev_stars_24h * 0.5:
                     repo["trend_status"] = "declining"
@@ -170,9 +319,12 @@ class GitHubCollector:
 
         return repos
 
+    def _now(self) -> datetime:
+        return self.now or datetime.now()
+
     def _load_yesterday_snapshot(self) -> list[dict]:
         """加载昨日快照"""
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        yesterday = (self._now() - timedelta(days=1)).strftime("%Y-%m-%d")
         snapshot_file = self.data_dir / f"github_snapshot_{yesterday}.json"
         if snapshot_file.exists():
             try:
@@ -183,13 +335,13 @@ class GitHubCollector:
 
     def _save_today_snapshot(self, repos: list[dict]):
         """保存今日快照供明天对比"""
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = self._now().strftime("%Y-%m-%d")
         snapshot_file = self.data_dir / f"github_snapshot_{today}.json"
         snapshot = [
             {
                 "name": r["name"],
                 "stars": r["stars"],
-                "stars_24h": r["stars_24h"],
+                "stars_24h": r["stars_24h"] if _on_daily(r) else None,
                 "trending_days": r.get("trending_days", 1),
             }
             for r in repos
@@ -198,7 +350,7 @@ class GitHubCollector:
 
     def _filter_new_repos(self, repos: list[dict]) -> list[dict]:
         """筛选创建 ≤ 30 天的新 repo"""
-        cutoff = datetime.now() - timedelta(days=30)
+        cutoff = self._now().replace(tzinfo=None) - timedelta(days=30)
         new_repos = []
         for r in repos:
             if r.get("created_at"):
@@ -212,9 +364,7 @@ class GitHubCollector:
         new_repos.sort(key=lambda r: r.get("stars_24h", 0), reverse=True)
         return new_repos
 
-    def _parse_number(self, text: str) -> int:
-        text = text.strip().replace(",", "")
-        try:
-            return int(text)
-        except ValueError:
-            return 0
+
+def _on_daily(repo: dict) -> bool:
+    """是否出现在日榜上（只有日榜给出 24h 涨星）"""
+    return any(page.endswith("/daily") for page in repo.get("trending_pages", []))
@@ -0,0 +1,151 @@
+"""磁盘 HTTP 条件请求缓存（ETag / Last-Modified）"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 响应体已解码后存盘，回放时不能带这些头
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class HttpCache:
+    """按 URL 持久化 ETag / Last-Modified 和响应体，304 时回放缓存内容
+
+    GitHub API 的 304 不消耗限流额度，重跑 / 回填几乎免费。
+    按总字节数做 LRU 淘汰；命中统计通过 report() 写入 meta。
+    被淘汰的响应体在索引落盘后才删除，中途崩溃不会留下指向已删文件的索引。
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.body_dir = self.cache_dir / "bodies"
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        # key -> {etag, last_modified, headers, file, size}；顺序即 LRU 顺序（最近使用在末尾）
+        self.index: OrderedDict[str, dict] = self._load()
+        self.total_bytes = sum(e["size"] for e in self.index.values())
+        self._doomed: set[str] = set()  # 待 save() 后删除的响应体文件
+        self._sweep_orphans()
+
+    def _load(self) -> OrderedDict:
+        if self.index_file.exists():
+            try:
+                return OrderedDict(json.loads(self.index_file.read_text(encoding="utf-8")))
+            except Exception as e:
+                logger.warning(f"Failed to load http cache index: {e}")
+        return OrderedDict()
+
+    def _sweep_orphans(self):
+        """删除索引里没有的响应体（上次运行在 save() 前中断时留下的）"""
+        referenced = {e["file"] for e in self.index.values()}
+        for path in self.body_dir.glob("*.bin"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+
+    def save(self):
+        tmp = self.index_file.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.index, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.index_file)
+        for filename in self._doomed:
+            (self.body_dir / filename).unlink(missing_ok=True)
+        self._doomed.clear()
+
+    def report(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self.index),
+            "bytes": self.total_bytes,
+        }
+
+    async def get(self, client: httpx.AsyncClient, url: str, params: dict | None = None,
+                  headers: dict | None = None, **kwargs) -> httpx.Response:
+        """条件 GET：命中 304 时返回带缓存响应体的 200 响应"""
+        key = str(httpx.URL(url, params=params))
+        entry = self.index.get(key)
+        req_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                req_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                req_headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = await client.get(url, params=params, headers=req_headers, **kwargs)
+
+        if resp.status_code == 304 and entry:
+            body = self._read_body(entry)
+            if body is not None:
+                self.stats["hits"] += 1
+                self.index.move_to_end(key)
+                # 304 自带的头（如最新的限流额度）覆盖缓存的头
+                replay_headers = {**entry["headers"], **self._storable_headers(resp.headers)}
+                return httpx.Response(200, headers=replay_headers, content=body, request=resp.request)
+            # 响应体丢了：丢弃该条目，不带条件头重新请求完整响应
+            logger.warning(f"HTTP cache body missing for {key}, refetching")
+            self._remove(key)
+            resp = await client.get(url, params=params, headers=headers, **kwargs)
+
+        self.stats["misses"] += 1
+        if resp.status_code == 200 and ("ETag" in resp.headers or "Last-Modified" in resp.headers):
+            self._store(key, resp)
+        return resp
+
+    def _read_body(self, entry: dict) -> bytes | None:
+        try:
+            return (self.body_dir / entry["file"]).read_bytes()
+        except OSError:
+            return None
+
+    def _store(self, key: str, resp: httpx.Response):
+        body = resp.content
+        if len(body) > self.max_bytes:
+            return
+        self._remove(key)
+        filename = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bin"
+        self._doomed.discard(filename)
+        (self.body_dir / filename).write_bytes(body)
+        self.index[key] = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "headers": self._storable_headers(resp.headers),
+            "file": filename,
+            "size": len(body),
+            "stored_at": int(time.time()),
+        }
+        self.total_bytes += len(body)
+        self.stats["stores"] += 1
+        self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.index:
+            key = next(iter(self.index))
+            self._remove(key)
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        entry = self.index.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry["size"]
+        self._doomed.add(entry["file"])
+
+    def _storable_headers(self, headers: httpx.Headers) -> dict:
+        return {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS}
+
+
+async def cached_get(client: httpx.AsyncClient, url: str, cache: HttpCache | None = None,
+                     **kwargs) -> httpx.Response:
+    """有缓存走条件请求，否则直接 GET"""
+    if cache is None:
+        return await client.get(url, **kwargs)
+    return await cache.get(client, url, **kwargs)
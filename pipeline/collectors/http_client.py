@@ -0,0 +1,123 @@
+"""全流程共享的 HTTP 连接池（HTTP/2 + keep-alive + 按 host 限流）"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """在底层 transport 外加全局在途上限和每个 host 的在途上限
+
+    名额在响应体读完 / 关闭时才归还，流式读取也计入在途。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int = 8, max_in_flight: int = 32):
+        self._transport = transport
+        self._per_host = per_host
+        self._global = asyncio.Semaphore(max_in_flight)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host_sem = self._hosts.setdefault(request.url.host, asyncio.Semaphore(self._per_host))
+        await self._global.acquire()
+        try:
+            await host_sem.acquire()
+        except BaseException:
+            # 等待 host 槽位时被取消，归还已占的全局槽位
+            self._global.release()
+            raise
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                host_sem.release()
+                self._global.release()
+
+        try:
+            resp = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        return httpx.Response(
+            resp.status_code,
+            headers=resp.headers,
+            stream=_ReleasingStream(resp.stream, release),
+            extensions=resp.extensions,
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_pool_transport(config) -> httpx.AsyncHTTPTransport:
+    http2 = config.http2 and _http2_available()
+    if config.http2 and not http2:
+        logger.info("h2 package not installed, falling back to HTTP/1.1")
+    return httpx.AsyncHTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_connections,
+            keepalive_expiry=30,
+        ),
+        retries=1,
+    )
+
+
+def create_client(config, transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """创建一次运行共用的 AsyncClient，由 run_pipeline 持有并注入各采集器
+
+    transport 默认为连接池；录制 / 回放时传入对应 transport。
+    """
+    if transport is None:
+        transport = create_pool_transport(config)
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(
+            transport,
+            per_host=config.http_per_host_connections,
+            max_in_flight=config.http_max_connections,
+        ),
+        timeout=30,
+    )
+
+
+@asynccontextmanager
+async def use_client(client: httpx.AsyncClient | None, **kwargs):
+    """有注入的共享 client 就直接用（不关闭），否则临时开一个"""
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient(**kwargs) as own:
+        yield own
+
@@ -0,0 +1,139 @@
+"""限流感知的并发预算：根据 GitHub 响应头动态调整在途请求数"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBudget:
+    """读取 X-RateLimit-Remaining / X-RateLimit-Reset / Retry-After，控制并发
+
+    - 额度未知时只放行 1 个探测请求，拿到响应头后再放开并发
+    - 在途请求数不超过剩余额度（扣除保留额度）
+    - 被限流时暂停到 reset / Retry-After；等待过久则标记耗尽，后续请求直接放弃
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        reserve: int = 5,
+        overflow_reserve: int = 100,
+        max_wait: float = 60.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.reserve = reserve                    # 为其他调用保留的额度
+        self.overflow_reserve = overflow_reserve  # 超出常规上限的请求需要的富余额度
+        self.max_wait = max_wait                  # 被限流时最多等待的秒数
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.exhausted = False
+        self.stats = {"requests": 0, "rate_limited": 0, "skipped": 0}
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self, overflow: bool = False) -> bool:
+        """申请一个请求名额；额度耗尽或（overflow 时）富余不足返回 False"""
+        async with self._cond:
+            while True:
+                if self.exhausted:
+                    self.stats["skipped"] += 1
+                    return False
+
+                delay = self._resume_at - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                if overflow and (self.remaining is None or self.remaining <= self.overflow_reserve):
+                    # 额度未知时先等常规请求探明
+                    if self.remaining is None and self._in_flight:
+                        await self._cond.wait()
+                        continue
+                    self.stats["skipped"] += 1
+                    return False
+
+                if self._in_flight < self._limit():
+                    self._in_flight += 1
+                    self.stats["requests"] += 1
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return True
+
+                if not self._in_flight:
+                    # 没有在途请求却无额度可用：等到 reset 或放弃
+                    self._pause_until_reset()
+                    continue
+
+                await self._cond.wait()
+
+    async def release(self, resp: httpx.Response | None) -> bool:
+        """归还名额并根据响应头更新额度；返回该响应是否因限流失败（可重试）"""
+        async with self._cond:
+            self._in_flight -= 1
+            limited = False
+            if resp is not None:
+                self._update(resp.headers)
+                limited = self._is_rate_limited(resp)
+                if limited:
+                    self.stats["rate_limited"] += 1
+                    self._pause(self._limited_wait(resp.headers))
+            self._cond.notify_all()
+            return limited
+
+    def _limit(self) -> int:
+        if self.remaining is None:
+            return 1
+        return max(0, min(self.max_concurrency, self.remaining - self.reserve))
+
+    def _update(self, headers: httpx.Headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        try:
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+        except ValueError:
+            pass
+
+    def _is_rate_limited(self, resp: httpx.Response) -> bool:
+        if resp.status_code == 429:
+            return True
+        if resp.status_code != 403:
+            return False
+        # 403 也可能是仓库被封禁等原因，只有带限流标识时才算限流
+        return "Retry-After" in resp.headers or resp.headers.get("X-RateLimit-Remaining") == "0"
+
+    def _limited_wait(self, headers: httpx.Headers) -> float:
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        if self.reset_at:
+            return self.reset_at - time.time()
+        return self.max_wait + 1
+
+    def _pause_until_reset(self):
+        wait = self.reset_at - time.time() if self.reset_at else self.max_wait + 1
+        self._pause(wait)
+
+    def _pause(self, wait: float):
+        if wait > self.max_wait:
+            if not self.exhausted:
+                logger.warning(f"GitHub API rate limit exhausted, resets in {int(wait)}s")
+            self.exhausted = True
+            return
+        logger.info(f"GitHub API rate limited, pausing {wait:.1f}s")
+        self._resume_at = max(self._resume_at, time.monotonic() + max(wait, 0))
+        # reset 之后额度未知，重新探测
+        self.remaining = None
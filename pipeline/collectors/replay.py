@@ -0,0 +1,136 @@
+"""采集录制 / 回放：把上游原始响应存成按天压缩的 bundle，离线重放整条管道
+
+    python -m pipeline.main --record            # 正常采集，同时录制所有上游响应
+    python -m pipeline.main --replay            # 用进程内替身服务回放昨天的 bundle
+    python -m pipeline.main --replay 2026-03-01
+
+回放在临时目录里复制一份 data_dir 运行，输出也写到那里，不改动生产数据。
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# URL 中这些参数是密钥，落盘前脱敏（回放时同样脱敏后匹配）
+_SECRET_PARAMS = {"token", "api_key", "apikey", "key", "access_token"}
+
+# 响应体已解码后存盘，回放时不能带这些头
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _redact(url: httpx.URL) -> str:
+    parts = urlsplit(str(url))
+    query = [
+        (k, "REDACTED" if k.lower() in _SECRET_PARAMS else v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _request_key(request: httpx.Request) -> str:
+    """method + 脱敏 URL + 请求体哈希；不含请求头（鉴权、条件请求头每次不同）"""
+    body_hash = hashlib.sha1(request.content).hexdigest() if request.content else ""
+    return f"{request.method} {_redact(request.url)} {body_hash}"
+
+
+class ReplayBundle:
+    """一天的录制内容：同一请求按录制顺序保存多次响应"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.records: dict[str, list[dict]] = defaultdict(list)
+
+    @classmethod
+    def bundle_path(cls, data_dir: str | Path, date: str) -> Path:
+        return Path(data_dir) / "replay" / f"{date}.jsonl.gz"
+
+    def load(self) -> "ReplayBundle":
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self.records[record["key"]].append(record)
+        return self
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for records in self.records.values():
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        logger.info(f"Recorded {len(self)} responses to {self.path}")
+
+    def add(self, request: httpx.Request, response: httpx.Response, body: bytes, elapsed: float):
+        key = _request_key(request)
+        self.records[key].append({
+            "key": key,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed_ms": round(elapsed * 1000),
+        })
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self.records.values())
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """透传请求，同时把完整响应写入 bundle"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, bundle: ReplayBundle):
+        self._transport = transport
+        self._bundle = bundle
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        resp = await self._transport.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in resp.stream])
+        finally:
+            await resp.stream.aclose()
+        # 解码后的响应体，避免回放时重复解压
+        decoded = httpx.Response(resp.status_code, headers=resp.headers, content=body).content
+        self._bundle.add(request, resp, decoded, time.monotonic() - start)
+        headers = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+        return httpx.Response(resp.status_code, headers=headers, content=decoded, extensions=resp.extensions)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """进程内替身服务：按请求 key 依次返回录制的响应，用完后重复最后一条
+
+    未录制的请求返回 504，采集器按上游失败处理。
+    """
+
+    def __init__(self, bundle: ReplayBundle):
+        self._bundle = bundle
+        self._cursor: dict[str, int] = defaultdict(int)
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _request_key(request)
+        records = self._bundle.records.get(key)
+        if not records:
+            self.misses += 1
+            logger.debug(f"Replay miss: {key}")
+            return httpx.Response(504, text=f"not recorded: {key}")
+
+        index = min(self._cursor[key], len(records) - 1)
+        self._cursor[key] += 1
+        record = records[index]
+        return httpx.Response(
+            record["status"],
+            headers=record["headers"],
+            content=base64.b64decode(record["body"]),
+        )
@@ -0,0 +1,258 @@
+"""github.com/trending 页面解析器 — BS4 参考实现 + lxml 单趟快速实现
+
+对比两个后端的解析结果并计时，结果不一致或解析为空时退出码为 1。
+不带参数时检查 fixtures/ 下的所有页面；handmade_trending.html 是手工仿写的样例，
+真实页面用 --save 从 github.com 抓取后存为 fixtures/trending_<语言>_<周期>.html：
+
+    python -m pipeline.collectors.trending_parser
+    python -m pipeline.collectors.trending_parser --save "" python rust
+    python -m pipeline.collectors.trending_parser saved_trending.html [more.html ...]
+"""
+
+import re
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+HANDMADE_PAGE = FIXTURES_DIR / "handmade_trending.html"
+TRENDING_URL = "https://github.com/trending"
+
+_STARS_RE = re.compile(r"([\d,]+)")
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class TrendingParser(ABC):
+    """从 trending 页面提取 name / description / language / stars / forks / stars_24h"""
+
+    @abstractmethod
+    def parse(self, html: str) -> list[dict]:
+        ...
+
+    def _build_repo(self, full_name: str, description: str, language: str,
+                    stars_text: list[str], stars_today_text: str | None) -> dict | None:
+        full_name = full_name.strip("/")
+        if "/" not in full_name:
+            return None
+        owner, _ = full_name.split("/", 1)
+
+        stars = self._parse_number(stars_text[0]) if len(stars_text) >= 1 else 0
+        forks = self._parse_number(stars_text[1]) if len(stars_text) >= 2 else 0
+
+        stars_24h = 0
+        if stars_today_text is not None:
+            match = _STARS_RE.search(stars_today_text)
+            if match:
+                stars_24h = int(match.group(1).replace(",", ""))
+
+        return {
+            "name": full_name,
+            "owner": owner,
+            "description": description,
+            "stars": stars,
+            "forks": forks,
+            "stars_24h": stars_24h,
+            "language": language,
+            "created_at": None,
+            "topics": [],
+            "readme_summary": "",
+            "watchers": 0,
+            "open_issues": 0,
+        }
+
+    def _parse_number(self, text: str) -> int:
+        text = text.strip().replace(",", "")
+        try:
+            return int(text)
+        except ValueError:
+            return 0
+
+
+class BS4TrendingParser(TrendingParser):
+    """BeautifulSoup 参考实现：每个 article 多次 CSS select"""
+
+    def parse(self, html: str) -> list[dict]:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "lxml")
+        repos = []
+
+        for article in soup.select("article.Box-row"):
+            try:
+                h2 = article.select_one("h2 a")
+                if not h2:
+                    continue
+
+                desc_el = article.select_one("p")
+                lang_el = article.select_one("[itemprop='programmingLanguage']")
+                stars_el = article.select("a.Link--muted")
+                stars_today_el = article.select_one("span.d-inline-block.float-sm-right")
+
+                repo = self._build_repo(
+                    h2.get("href", ""),
+                    desc_el.get_text(strip=True) if desc_el else "",
+                    lang_el.get_text(strip=True) if lang_el else "",
+                    [el.get_text(strip=True) for el in stars_el[:2]],
+                    stars_today_el.get_text() if stars_today_el else None,
+                )
+                if repo:
+                    repos.append(repo)
+            except Exception as e:
+                logger.debug(f"Parse error for article: {e}")
+                continue
+
+        return repos
+
+
+class LxmlTrendingParser(TrendingParser):
+    """lxml 快速实现：每个 article 只做一次 XPath 求值
+
+    union 查询按文档顺序一次性返回所有候选节点，再按类别取第一个命中，
+    语义与 BS4 的 select_one / select 一致。
+    """
+
+    def __init__(self):
+        from lxml import etree
+
+        self._articles = etree.XPath(f"//article[{_has_class('Box-row')}]")
+        self._fields = etree.XPath(
+            ".//h2//a"
+            " | .//p"
+            " | .//*[@itemprop='programmingLanguage']"
+            f" | .//a[{_has_class('Link--muted')}]"
+            f" | .//span[{_has_class('d-inline-block')} and {_has_class('float-sm-right')}]"
+        )
+
+    def parse(self, html: str) -> list[dict]:
+        import lxml.html
+
+        if not html.strip():
+            return []
+        root = lxml.html.document_fromstring(html)
+        repos = []
+
+        for article in self._articles(root):
+            try:
+                link = desc_el = lang_el = stars_today_el = None
+                stars_el = []
+                for el in self._fields(article):
+                    tag = el.tag
+                    cls = f" {' '.join(el.get('class', '').split())} "
+                    if tag == "a":
+                        if link is None and self._in_h2(el, article):
+                            link = el
+                        if " Link--muted " in cls:
+                            stars_el.append(el)
+                    elif tag == "p":
+                        if desc_el is None:
+                            desc_el = el
+                    elif tag == "span" and " d-inline-block " in cls and " float-sm-right " in cls:
+                        if stars_today_el is None:
+                            stars_today_el = el
+                    if lang_el is None and el.get("itemprop") == "programmingLanguage":
+                        lang_el = el
+                if link is None:
+                    continue
+
+                repo = self._build_repo(
+                    link.get("href", ""),
+                    self._text(desc_el, strip=True) if desc_el is not None else "",
+                    self._text(lang_el, strip=True) if lang_el is not None else "",
+                    [self._text(el, strip=True) for el in stars_el[:2]],
+                    self._text(stars_today_el) if stars_today_el is not None else None,
+                )
+                if repo:
+                    repos.append(repo)
+            except Exception as e:
+                logger.debug(f"Parse error for article: {e}")
+                continue
+
+        return repos
+
+    def _in_h2(self, el, article) -> bool:
+        parent = el.getparent()
+        while parent is not None and parent is not article:
+            if parent.tag == "h2":
+                return True
+            parent = parent.getparent()
+        return False
+
+    def _text(self, el, strip: bool = False) -> str:
+        """等价于 BS4 的 get_text() / get_text(strip=True)"""
+        if strip:
+            return "".join(s.strip() for s in el.itertext())
+        return "".join(el.itertext())
+
+
+PARSERS = {
+    "bs4": BS4TrendingParser,
+    "lxml": LxmlTrendingParser,
+}
+
+
+def get_parser(name: str = "lxml") -> TrendingParser:
+    try:
+        return PARSERS[name]()
+    except KeyError:
+        logger.warning(f"Unknown trending parser '{name}', using lxml")
+        return LxmlTrendingParser()
+
+
+def _benchmark(paths: list[str], rounds: int = 20) -> bool:
+    """解析结果一致性检查 + 计时；全部一致返回 True"""
+    import time
+
+    pages = [Path(p).read_text(encoding="utf-8") for p in paths]
+    reference = BS4TrendingParser()
+    fast = LxmlTrendingParser()
+
+    ok = True
+    for path, html in zip(paths, pages):
+        expected, actual = reference.parse(html), fast.parse(html)
+        status = "EMPTY" if not expected else "OK" if expected == actual else "MISMATCH"
+        ok = ok and status == "OK"
+        print(f"[{status}] {path}: {len(expected)} repos")
+
+    for parser in (reference, fast):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for html in pages:
+                parser.parse(html)
+        elapsed = (time.perf_counter() - start) / (rounds * len(pages))
+        print(f"{parser.__class__.__name__}: {elapsed * 1000:.2f} ms/page")
+    return ok
+
+
+def _save_pages(languages: list[str], period: str = "daily") -> list[str]:
+    """从 github.com 抓取真实 trending 页面存入 fixtures/（空字符串表示全部语言）"""
+    import httpx
+
+    paths = []
+    with httpx.Client(timeout=30, follow_redirects=True) as client:
+        for lang in languages:
+            url = f"{TRENDING_URL}/{lang}" if lang else TRENDING_URL
+            resp = client.get(url, params={"since": period})
+            resp.raise_for_status()
+            path = FIXTURES_DIR / f"trending_{lang or 'all'}_{period}.html"
+            path.write_text(resp.text, encoding="utf-8")
+            print(f"saved {resp.url} -> {path}")
+            paths.append(str(path))
+    return paths
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = sys.argv[1:]
+    if args[:1] == ["--save"]:
+        paths = _save_pages(args[1:] or [""])
+    else:
+        paths = args or sorted(str(p) for p in FIXTURES_DIR.glob("*.html"))
+    if paths == [str(HANDMADE_PAGE)]:
+        print("WARNING: only the hand-made sample was checked; run with --save to capture real pages")
+    sys.exit(0 if _benchmark(paths) else 1)
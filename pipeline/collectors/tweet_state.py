@@ -0,0 +1,184 @@
+"""推文增量采集状态：按查询持久化高水位 + 当日推文合并存储"""
+
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ENGAGEMENT_FIELDS = ("likes", "reposts", "replies", "bookmarks")
+
+
+def _window_of(date_range: tuple) -> str:
+    return date_range[0].strftime("%Y-%m-%d")
+
+
+class HighWaterMarks:
+    """每个查询已抓到的位置：since_id（推文 ID）/ last_ts（发布时间戳）
+
+    高水位只在同一日期窗口内有效；换天后自动失效，重新全量抓取该窗口。
+    查询时往回退 overlap 秒：最近这段时间的帖子会被重新抓到，用来刷新互动数。
+    """
+
+    def __init__(self, path: Path, overlap: float = 6 * 3600):
+        self.path = path
+        self.overlap = overlap
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.marks: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        if self.path.exists():
+            try:
+                return json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Failed to load high-water marks: {e}")
+        return {}
+
+    def save(self):
+        self.path.write_text(json.dumps(self.marks, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def get(self, key: str, date_range: tuple) -> dict:
+        mark = self.marks.get(key)
+        if mark and mark.get("window") == _window_of(date_range):
+            return mark
+        return {}
+
+    def since_id(self, key: str, date_range: tuple) -> str | None:
+        """查询用的 since_id：回退 overlap 秒（snowflake ID 右移 22 位即毫秒时间戳）"""
+        since_id = self.get(key, date_range).get("since_id")
+        if not since_id:
+            return None
+        backed = int(since_id) - (int(self.overlap * 1000) << 22)
+        return str(backed) if backed > 0 else None
+
+    def last_ts(self, key: str, date_range: tuple) -> int:
+        """查询用的 last_ts：回退 overlap 秒"""
+        last_ts = self.get(key, date_range).get("last_ts", 0)
+        return max(int(last_ts - self.overlap), 0) if last_ts else 0
+
+    def advance(self, key: str, date_range: tuple, since_id: str | None = None, last_ts: int | None = None):
+        mark = self.get(key, date_range)
+        mark = {**mark, "window": _window_of(date_range)}
+        if since_id and (not mark.get("since_id") or int(since_id) > int(mark["since_id"])):
+            mark["since_id"] = since_id
+        if last_ts and last_ts > mark.get("last_ts", 0):
+            mark["last_ts"] = last_ts
+        self.marks[key] = mark
+
+    def advance_ids(self, key: str, date_range: tuple, items: list[dict]):
+        """用一批推文中最大的数字 ID 推进 since_id"""
+        ids = [int(i) for i in (str(item.get("id", "")) for item in items) if i.isdigit()]
+        if ids:
+            self.advance(key, date_range, since_id=str(max(ids)))
+
+
+class TweetStore:
+    """当日已采集推文，按 ID 合并：新推文追加，已见过的只更新互动数
+
+    磁盘上是追加写入的 JSONL：每行是一条新推文，或一条 {"id", "engagement"} 互动数更新；
+    内存里只保留 ID → 互动数，不随当日推文量持有整条推文。save() 时把更新折叠回推文行。
+    """
+
+    def __init__(self, data_dir: str | Path, date_range: tuple):
+        self.path = Path(data_dir) / "tweets" / f"{_window_of(date_range)}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.engagement: dict[str, tuple] = {}
+        self._updates = 0  # 文件中尚未折叠的更新行数
+        self._file = None
+        for record in self._records():
+            if "engagement" in record:
+                self._apply(str(record["id"]), record["engagement"])
+                self._updates += 1
+            else:
+                self.engagement[str(record.get("id", ""))] = _engagement_of(record)
+
+    def _records(self):
+        """逐行读取；中断写入留下的残行跳过"""
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping corrupt line in {self.path}")
+
+    def _append(self, record: dict):
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _apply(self, tweet_id: str, changes: dict) -> bool:
+        """把互动数更新合进索引，有变化返回 True"""
+        old = self.engagement.get(tweet_id)
+        if old is None:
+            return False
+        new = tuple(changes.get(field, value) for field, value in zip(ENGAGEMENT_FIELDS, old))
+        self.engagement[tweet_id] = new
+        return new != old
+
+    def save(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._updates:
+            self._compact()
+
+    def _compact(self):
+        """把更新行折叠回推文行：逐行流式重写，不整体载入"""
+        tmp = self.path.with_suffix(".jsonl.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for record in self._records():
+                if "engagement" in record:
+                    continue
+                values = self.engagement.get(str(record.get("id", "")), ())
+                for field, value in zip(ENGAGEMENT_FIELDS, values):
+                    if value is not None:
+                        record[field] = value
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        tmp.replace(self.path)
+        self._updates = 0
+
+    def merge(self, items: list[dict]) -> tuple[int, int]:
+        """返回 (新增数, 更新数)"""
+        added = updated = 0
+        for item in items:
+            if self.merge_one(item):
+                added += 1
+            else:
+                updated += 1
+        return added, updated
+
+    def merge_one(self, item: dict) -> bool:
+        """新推文返回 True；已存在则刷新互动数并返回 False"""
+        tweet_id = str(item.get("id", ""))
+        if tweet_id not in self.engagement:
+            self.engagement[tweet_id] = _engagement_of(item)
+            self._append(item)
+            return True
+        changes = {field: item[field] for field in ENGAGEMENT_FIELDS if field in item}
+        if self._apply(tweet_id, changes):
+            self._append({"id": tweet_id, "engagement": changes})
+            self._updates += 1
+        return False
+
+    def all(self) -> list[dict]:
+        """从磁盘读出当日全部推文（已合并互动数更新）"""
+        if self._file is not None:
+            self._file.flush()
+        tweets: dict[str, dict] = {}
+        for record in self._records():
+            tweet_id = str(record.get("id", ""))
+            if "engagement" in record:
+                if tweet_id in tweets:
+                    tweets[tweet_id].update(record["engagement"])
+            else:
+                tweets[tweet_id] = record
+        return list(tweets.values())
+
+    def __len__(self) -> int:
+        return len(self.engagement)
+
+
+def _engagement_of(item: dict) -> tuple:
+    return tuple(item.get(field) for field in ENGAGEMENT_FIELDS)
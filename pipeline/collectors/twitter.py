@@ -1,59 +1,189 @@
 """X/Twitter 数据采集 — 多策略切换"""
 
+import asyncio
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from datetime import datetime
+from pathlib import Path
 
 import httpx
 
+from pipeline.collectors.http_cache import HttpCache, cached_get
+from pipeline.collectors.http_client import use_client
+from pipeline.collectors.tweet_state import HighWaterMarks, TweetStore
+
 logger = logging.getLogger(__name__)
 
 
 class FetchStrategy(ABC):
+    is_fallback = False  # 降级策略不参与自适应排序，始终最后尝试
+
     @abstractmethod
     async def fetch(self, keywords: list[str], date_range: tuple) -> list[dict]:
         ...
 
+    async def stream(self, keywords: list[str], date_range: tuple) -> AsyncIterator[dict]:
+        """逐条产出结果；默认等 fetch 全部返回后再产出，支持分页的策略可覆盖"""
+        for item in await self.fetch(keywords, date_range):
+            yield item
 
-class ApifyStrategy(FetchStrategy):
-    """Apify Tweet Scraper V2 (apidojo/tweet-scraper)"""
-
-    ACTOR_URL = "https://api.apify.com/v2/acts/apidojo~tweet-scraper/run-sync-get-dataset-items"
 
-    def __init__(self, config):
+class ApifyStrategy(FetchStrategy):
+    """Apify Tweet Scraper V2 (apidojo/tweet-scraper)
+
+    stream 模式：异步启动 run，边跑边分页读取 dataset，逐条产出推文，
+    下游不必等整个抓取结束，maxItems 调大也不会一次性载入全部结果。
+    sync 模式：run-sync-get-dataset-items 一次性返回全部结果。
+    结果被 maxItems 截断或 run 未成功时不推进高水位，避免漏掉没取到的推文。
+    """
+
+    API_BASE = "https://api.apify.com/v2"
+    ACTOR_ID = "apidojo~tweet-scraper"
+    ACTOR_URL = f"{API_BASE}/acts/{ACTOR_ID}/run-sync-get-dataset-items"
+    RUN_TIMEOUT = 300      # 整个抓取的时间预算（秒）
+    PAGE_SIZE = 100        # dataset 每页条数
+    POLL_WAIT = 5          # 每次轮询 run 状态最多等待的秒数
+    TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+
+    def __init__(self, config, client: httpx.AsyncClient | None = None, marks: HighWaterMarks | None = None):
         self.api_key = config.twitter_scraper_key
+        self.client = client
+        self.marks = marks
+        self.max_items = config.apify_max_items
+        self.mode = config.apify_mode
 
     async def fetch(self, keywords: list[str], date_range: tuple) -> list[dict]:
-        if not self.api_key:
-            raise ValueError("Apify API key not configured")
+        if self.mode == "sync":
+            return await self._fetch_sync(keywords, date_range)
+        return [tweet async for tweet in self.stream(keywords, date_range)]
 
+    def _search_terms(self, keywords: list[str]) -> list[str]:
         # 每组取几个关键词 OR 连接，分批搜索
         search_terms = []
         batch_size = 4
         for i in range(0, min(len(keywords), 12), batch_size):
             batch = keywords[i:i + batch_size]
             search_terms.append(" OR ".join(f'"{kw}"' for kw in batch))
+        return search_terms
+
+    def _mark_key(self, keywords: list[str]) -> str:
+        return "apify:" + " | ".join(self._search_terms(keywords))
+
+    def _build_input(self, keywords: list[str], date_range: tuple) -> dict:
+        search_terms = self._search_terms(keywords)
+
+        # 同一窗口内只抓上次之后的新推文
+        since_id = self.marks.since_id(self._mark_key(keywords), date_range) if self.marks else None
+        if since_id:
+            search_terms = [f"({term}) since_id:{since_id}" for term in search_terms]
 
         start_date, end_date = date_range
+        # 不设 tweetLanguage，同时抓中英文
+        return {
+            "searchTerms": search_terms,
+            "maxItems": self.max_items,
+            # 增量抓取按时间取最新的；Top 排序被 maxItems 截断时缺的推文散落在 since_id 之后
+            "sort": "Latest" if since_id else "Top",
+            "start": start_date.strftime("%Y-%m-%d"),
+            "end": end_date.strftime("%Y-%m-%d"),
+        }
+
+    async def _fetch_sync(self, keywords: list[str], date_range: tuple) -> list[dict]:
+        if not self.api_key:
+            raise ValueError("Apify API key not configured")
 
-        all_items = []
-        async with httpx.AsyncClient(timeout=300) as client:
-            # 不设 tweetLanguage，同时抓中英文
+        async with use_client(self.client) as client:
             resp = await client.post(
                 self.ACTOR_URL,
+                timeout=self.RUN_TIMEOUT,
                 params={"token": self.api_key},
-                json={
-                    "searchTerms": search_terms,
-                    "maxItems": 100,
-                    "sort": "Top",
-                    "start": start_date.strftime("%Y-%m-%d"),
-                    "end": end_date.strftime("%Y-%m-%d"),
-                },
+                json=self._build_input(keywords, date_range),
             )
             resp.raise_for_status()
             all_items = resp.json()
 
-        return [self._normalize(item) for item in all_items if self._has_text(item)]
+        tweets = [self._normalize(item) for item in all_items if self._has_text(item)]
+        if self.marks and len(all_items) < self.max_items:
+            self.marks.advance_ids(self._mark_key(keywords), date_range, tweets)
+        return tweets
+
+    async def stream(self, keywords: list[str], date_range: tuple) -> AsyncIterator[dict]:
+        if not self.api_key:
+            raise ValueError("Apify API key not configured")
+
+        params = {"token": self.api_key}
+        max_id = 0
+        complete = False
+        async with use_client(self.client, timeout=60) as client:
+            resp = await client.post(
+                f"{self.API_BASE}/acts/{self.ACTOR_ID}/runs",
+                params=params,
+                json=self._build_input(keywords, date_range),
+            )
+            resp.raise_for_status()
+            run = resp.json()["data"]
+            run_id, dataset_id = run["id"], run["defaultDatasetId"]
+
+            deadline = time.monotonic() + self.RUN_TIMEOUT
+            offset = 0
+            status = run.get("status", "")
+            try:
+                while True:
+                    if status not in self.TERMINAL_STATUSES:
+                        resp = await client.get(
+                            f"{self.API_BASE}/actor-runs/{run_id}",
+                            params={**params, "waitForFinish": self.POLL_WAIT},
+                        )
+                        resp.raise_for_status()
+                        status = resp.json()["data"]["status"]
+
+                    # 先确认状态再读完已有结果：状态为终态时这一轮即读到全部数据
+                    while True:
+                        resp = await client.get(
+                            f"{self.API_BASE}/datasets/{dataset_id}/items",
+                            params={**params, "offset": offset, "limit": self.PAGE_SIZE, "clean": "true"},
+                        )
+                        resp.raise_for_status()
+                        items = resp.json()
+                        offset += len(items)
+                        for item in items:
+                            if self._has_text(item):
+                                tweet = self._normalize(item)
+                                if str(tweet["id"]).isdigit():
+                                    max_id = max(max_id, int(tweet["id"]))
+                                yield tweet
+                        if len(items) < self.PAGE_SIZE:
+                            break
+
+                    if status in self.TERMINAL_STATUSES:
+                        if status != "SUCCEEDED":
+                            logger.warning(f"Apify run {run_id} ended with {status} after {offset} items")
+                            if not offset:
+                                raise RuntimeError(f"Apify run {status}")
+                        complete = status == "SUCCEEDED" and offset < self.max_items
+                        break
+
+                    if time.monotonic() > deadline:
+                        logger.warning(f"Apify run {run_id} exceeded {self.RUN_TIMEOUT}s, aborting")
+                        break
+            finally:
+                # 超时、出错、下游提前停止或被取消时 run 仍在计费，主动中止
+                if status not in self.TERMINAL_STATUSES:
+                    await self._abort(client, run_id, params)
+
+        if self.marks and max_id and complete:
+            self.marks.advance(self._mark_key(keywords), date_range, since_id=str(max_id))
+
+    async def _abort(self, client: httpx.AsyncClient, run_id: str, params: dict):
+        try:
+            resp = await client.post(f"{self.API_BASE}/actor-runs/{run_id}/abort", params=params)
+            resp.raise_for_status()
+            logger.info(f"Aborted Apify run {run_id}")
+        except Exception as e:
+            logger.warning(f"Failed to abort Apify run {run_id}: {e}")
 
     def _has_text(self, item: dict) -> bool:
         return bool(item.get("text") or item.get("full_text") or item.get("tweetText"))
@@ -87,19 +217,25 @@ class SocialDataStrategy(FetchStrategy):
 
     BASE_URL = "https://api.socialdata.tools"
 
-    def __init__(self, config):
+    def __init__(self, config, client: httpx.AsyncClient | None = None, marks: HighWaterMarks | None = None):
         self.api_key = config.twitter_scraper_key
+        self.client = client
+        self.marks = marks
 
     async def fetch(self, keywords: list[str], date_range: tuple) -> list[dict]:
         if not self.api_key:
             raise ValueError("SocialData API key not configured")
 
         query = " OR ".join(keywords[:5])
-        start_date, end_date = date_range
+        mark_key = f"socialdata:{query}"
+        since_id = self.marks.since_id(mark_key, date_range) if self.marks else None
+        if since_id:
+            query = f"({query}) since_id:{since_id}"
 
-        async with httpx.AsyncClient(timeout=60) as client:
+        async with use_client(self.client) as client:
             resp = await client.get(
                 f"{self.BASE_URL}/twitter/search",
+                timeout=60,
                 headers={"Authorization": f"Bearer {self.api_key}"},
                 params={
                     "query": query,
@@ -109,8 +245,11 @@ class SocialDataStrategy(FetchStrategy):
             resp.raise_for_status()
             data = resp.json()
 
-        tweets = data.get("tweets", [])
-        return [self._normalize(t) for t in tweets if t.get("full_text")]
+        tweets = [self._normalize(t) for t in data.get("tweets", []) if t.get("full_text")]
+        # 只取了第一页：还有下一页时没取到的推文比已取到的旧，不能推进
+        if self.marks and not data.get("next_cursor"):
+            self.marks.advance_ids(mark_key, date_range, tweets)
+        return tweets
 
     def _normalize(self, item: dict) -> dict:
         user = item.get("user", {})
@@ -131,82 +270,327 @@ class HackerNewsStrategy(FetchStrategy):
     """Hacker News API 降级方案 — 获取 AI 相关帖子"""
 
     HN_SEARCH_URL = "https://hn.algolia.com/api/v1/search"
+    HN_SEARCH_BY_DATE_URL = "https://hn.algolia.com/api/v1/search_by_date"
+    is_fallback = True
+    SEARCH_TERMS = [
+        "AI coding", "LLM", "Claude", "GPT",
+        "Cursor", "Copilot", "OpenAI", "Gemini",
+        "Anthropic", "DeepSeek", "Llama", "Mistral",
+    ]
+    HITS_PER_PAGE = 10
+    MAX_PAGES = 3        # 热门词最多翻到第几页
+    MAX_CONCURRENCY = 12  # 同时在途的 Algolia 查询数（共享 client 另有按 host 上限）
+
+    def __init__(self, http_cache: HttpCache | None = None, client: httpx.AsyncClient | None = None,
+                 marks: HighWaterMarks | None = None):
+        self.http_cache = http_cache
+        self.client = client
+        self.marks = marks
 
     async def fetch(self, keywords: list[str], date_range: tuple) -> list[dict]:
         start_ts = int(date_range[0].timestamp())
         end_ts = int(date_range[1].timestamp())
 
-        results = []
-        search_terms = [
-            "AI coding", "LLM", "Claude", "GPT",
-            "Cursor", "Copilot", "OpenAI", "Gemini",
-            "Anthropic", "DeepSeek", "Llama", "Mistral",
-        ]
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            for term in search_terms:
-                try:
-                    resp = await client.get(
-                        self.HN_SEARCH_URL,
-                        params={
-                            "query": term,
-                            "tags": "story",
-                            "numericFilters": f"created_at_i>{start_ts},created_at_i<{end_ts}",
-                            "hitsPerPage": 10,
-                        },
-                    )
-                    resp.raise_for_status()
-                    hits = resp.json().get("hits", [])
-                    for hit in hits:
-                        results.append({
-                            "id": f"hn_{hit.get('objectID', '')}",
-                            "author_name": hit.get("author", ""),
-                            "author_handle": f"@{hit.get('author', '')}",
-                            "text": f"{hit.get('title', '')}. {hit.get('url', '')}",
-                            "created_at": hit.get("created_at", ""),
-                            "likes": hit.get("points", 0),
-                            "reposts": 0,
-                            "replies": hit.get("num_comments", 0),
-                            "bookmarks": 0,
-                        })
-                except Exception as e:
-                    logger.debug(f"HN search failed for '{term}': {e}")
-
-        # 去重
         seen_ids = set()
         unique = []
-        for r in results:
-            if r["id"] not in seen_ids:
-                seen_ids.add(r["id"])
-                unique.append(r)
+        sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        async with use_client(self.client, timeout=30) as client:
+            tasks = []
+            for term in self.SEARCH_TERMS:
+                # 同一窗口内只抓上次最新帖子之后发布的（含回退的重叠时段）；
+                # 增量时按时间排序，首次按相关度取热门
+                last_ts = self.marks.last_ts(f"hn:{term}", date_range) if self.marks else 0
+                url = self.HN_SEARCH_BY_DATE_URL if last_ts else self.HN_SEARCH_URL
+                numeric_filters = f"created_at_i>{max(start_ts, last_ts)},created_at_i<{end_ts}"
+                tasks.append(asyncio.create_task(self._search_term(client, sem, url, term, numeric_filters)))
+            # 所有查询已并发发出；按词序逐个合并，边到边按 objectID 去重
+            for term, task in zip(self.SEARCH_TERMS, tasks):
+                hits, complete = await task
+                # 翻页被 MAX_PAGES 截断或有页失败时，没取到的帖子可能比已取到的旧，不推进
+                if self.marks and hits and complete:
+                    self.marks.advance(
+                        f"hn:{term}", date_range, last_ts=max(h.get("created_at_i", 0) for h in hits)
+                    )
+                for hit in hits:
+                    object_id = hit.get("objectID", "")
+                    if object_id in seen_ids:
+                        continue
+                    seen_ids.add(object_id)
+                    unique.append(self._normalize(hit))
         return unique
 
+    async def _search_term(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str,
+                           term: str, numeric_filters: str) -> tuple[list[dict], bool]:
+        """首页命中满一页且还有后续页时，并发补抓后续页
+
+        返回 (命中, 是否读完了全部页)。
+        """
+        first = await self._search_page(client, sem, url, term, numeric_filters, 0)
+        if first is None:
+            return [], False
+        hits = first.get("hits", [])
+        total_pages = first.get("nbPages", 1)
+        pages = min(total_pages, self.MAX_PAGES)
+        complete = total_pages <= self.MAX_PAGES
+        if len(hits) >= self.HITS_PER_PAGE and pages > 1:
+            more = await asyncio.gather(*(
+                self._search_page(client, sem, url, term, numeric_filters, page)
+                for page in range(1, pages)
+            ))
+            for data in more:
+                if data:
+                    hits.extend(data.get("hits", []))
+                else:
+                    complete = False
+        return hits, complete
+
+    async def _search_page(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str,
+                           term: str, numeric_filters: str, page: int) -> dict | None:
+        async with sem:
+            try:
+                resp = await cached_get(
+                    client,
+                    url,
+                    self.http_cache,
+                    params={
+                        "query": term,
+                        "tags": "story",
+                        "numericFilters": numeric_filters,
+                        "hitsPerPage": self.HITS_PER_PAGE,
+                        "page": page,
+                    },
+                )
+                resp.raise_for_status()
+                return resp.json()
+            except Exception as e:
+                logger.debug(f"HN search failed for '{term}' (page {page}): {e}")
+                return None
+
+    def _normalize(self, hit: dict) -> dict:
+        return {
+            "id": f"hn_{hit.get('objectID', '')}",
+            "author_name": hit.get("author", ""),
+            "author_handle": f"@{hit.get('author', '')}",
+            "text": f"{hit.get('title', '')}. {hit.get('url', '')}",
+            "created_at": hit.get("created_at", ""),
+            "likes": hit.get("points", 0),
+            "reposts": 0,
+            "replies": hit.get("num_comments", 0),
+            "bookmarks": 0,
+        }
+
+
+class StrategyStats:
+    """各策略的延迟 / 成功率统计（EWMA），持久化后用于调整策略顺序"""
+
+    ALPHA = 0.3  # EWMA 平滑系数
+    CENSORED_PENALTY = 1.5  # 被对冲取消时真实耗时未知（只知道更长），按已耗时放大记录
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        if self.path.exists():
+            try:
+                return json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Failed to load strategy stats: {e}")
+        return {}
+
+    def save(self):
+        self.path.write_text(json.dumps(self.stats, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def record(self, name: str, latency: float, ok: bool):
+        s = self._entry(name)
+        self._update_ewma(s, latency * 1000)
+        s["success" if ok else "failure"] += 1
+
+    def record_censored(self, name: str, elapsed: float):
+        """被取消的一次运行：真实延迟 ≥ elapsed，不计成功 / 失败"""
+        s = self._entry(name)
+        ms = elapsed * 1000 * self.CENSORED_PENALTY
+        # 下界样本只会把估计往上拉，不会因为取消得早而显得更快
+        if s["ewma_ms"] is None or ms > s["ewma_ms"]:
+            self._update_ewma(s, ms)
+        s["cancelled"] = s.get("cancelled", 0) + 1
+
+    def _entry(self, name: str) -> dict:
+        return self.stats.setdefault(name, {"ewma_ms": None, "success": 0, "failure": 0})
+
+    def _update_ewma(self, s: dict, ms: float):
+        s["ewma_ms"] = round(ms if s["ewma_ms"] is None else self.ALPHA * ms + (1 - self.ALPHA) * s["ewma_ms"])
+
+    def score(self, name: str) -> float | None:
+        """期望代价：延迟 / 成功率；无历史记录返回 None"""
+        s = self.stats.get(name)
+        if not s or s["ewma_ms"] is None:
+            return None
+        success_rate = (s["success"] + 1) / (s["success"] + s["failure"] + 2)
+        return s["ewma_ms"] / success_rate
+
+    def rank(self, names: list[str]) -> list[str]:
+        """按期望代价升序排列
+
+        无历史的策略取有历史策略的平均代价（中性先验），既不抢在已知快的前面，
+        也不会永远排在最后得不到尝试；同分保持配置顺序。
+        """
+        scores = {name: self.score(name) for name in names}
+        known = [v for v in scores.values() if v is not None]
+        prior = sum(known) / len(known) if known else 0.0
+        return sorted(names, key=lambda name: prior if scores[name] is None else scores[name])
+
 
 class TwitterCollector:
-    """多策略切换的 X 采集器"""
+    """多策略切换的 X 采集器
 
-    def __init__(self, config):
+    hedge_delay > 0 时对冲执行：当前策略超过 hedge_delay 秒未返回就并行启动下一个，
+    取第一个非空结果并取消其余；策略失败 / 返回空时立即启动下一个。
+    主策略按历史延迟和成功率排序，降级策略（HN）始终排在最后。
+    """
+
+    def __init__(self, config, http_cache: HttpCache | None = None, client: httpx.AsyncClient | None = None):
         self.config = config
+        self.data_dir = Path(config.data_dir)
+        self.marks = HighWaterMarks(
+            self.data_dir / "twitter_hwm.json", overlap=config.twitter_refetch_overlap_hours * 3600
+        )
         self.strategies: list[FetchStrategy] = [
-            ApifyStrategy(config),
-            SocialDataStrategy(config),
-            HackerNewsStrategy(),  # 降级
+            ApifyStrategy(config, client, self.marks),
+            SocialDataStrategy(config, client, self.marks),
+            HackerNewsStrategy(http_cache, client, self.marks),  # 降级
         ]
+        self.hedge_delay = config.twitter_hedge_delay
+        self.stats = StrategyStats(self.data_dir / "twitter_strategy_stats.json")
+        self.latency: dict[str, float] = {}  # 本次运行各策略耗时（秒），cancelled 的不计（只进统计）
         self.all_keywords = []
         for group in config.twitter_keywords.values():
             self.all_keywords.extend(group)
 
+    def _ordered_strategies(self) -> list[FetchStrategy]:
+        primary = [s for s in self.strategies if not s.is_fallback]
+        fallback = [s for s in self.strategies if s.is_fallback]
+        order = self.stats.rank([s.__class__.__name__ for s in primary])
+        primary.sort(key=lambda s: order.index(s.__class__.__name__))
+        return primary + fallback
+
     async def collect(self, date_range: tuple) -> list[dict]:
-        for strategy in self.strategies:
-            try:
-                logger.info(f"Trying {strategy.__class__.__name__}...")
-                results = await strategy.fetch(self.all_keywords, date_range)
+        """返回该日期窗口内累计采集的全部推文（本次新抓的与之前的合并）"""
+        store = TweetStore(self.data_dir, date_range)
+        try:
+            if self.hedge_delay and self.hedge_delay > 0:
+                results = await self._collect_hedged(date_range)
+            else:
+                results = await self._collect_sequential(date_range)
+        finally:
+            self.stats.save()
+
+        added, updated = store.merge(results)
+        store.save()
+        self.marks.save()
+        logger.info(f"Tweets: {added} new, {updated} updated, {len(store)} total in window")
+        if not len(store):
+            logger.error("All Twitter strategies failed")
+        return store.all()
+
+    async def stream(self, date_range: tuple) -> AsyncIterator[dict]:
+        """按策略顺序流式产出：第一个产出数据的策略即被采用（不对冲）
+
+        已产出部分数据后策略出错，则保留已产出的部分，不再切换策略。
+        产出的推文同时合并进当日存储。
+        """
+        store = TweetStore(self.data_dir, date_range)
+        try:
+            for strategy in self._ordered_strategies():
+                name = strategy.__class__.__name__
+                logger.info(f"Streaming from {name}...")
+                start = time.monotonic()
+                count = 0
+                try:
+                    async for item in strategy.stream(self.all_keywords, date_range):
+                        count += 1
+                        store.merge_one(item)
+                        yield item
+                except Exception as e:
+                    logger.warning(f"{name} failed after {count} items: {e}")
+                self._record(name, start, ok=count > 0)
+                if count:
+                    logger.info(f"{name} streamed {count} items")
+                    return
+            logger.error("All Twitter strategies failed")
+        finally:
+            self.stats.save()
+            store.save()
+            self.marks.save()
+
+    async def _collect_sequential(self, date_range: tuple) -> list[dict]:
+        for strategy in self._ordered_strategies():
+            results = await self._run_strategy(strategy, date_range)
+            if results:
+                return results
+        return []
+
+    async def _collect_hedged(self, date_range: tuple) -> list[dict]:
+        queue = self._ordered_strategies()
+        pending: set[asyncio.Task] = set()
+
+        def launch_next():
+            strategy = queue.pop(0)
+            pending.add(asyncio.create_task(self._run_strategy(strategy, date_range)))
+
+        launch_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logger.info(f"No result after {self.hedge_delay}s, hedging with next strategy")
+                    launch_next()
+                    continue
+
+                pending -= done
+                # 同时完成的非空结果一并采用（它们的高水位已推进，不能丢弃）
+                results = [item for task in done for item in task.result()]
                 if results:
-                    logger.info(f"{strategy.__class__.__name__} returned {len(results)} items")
                     return results
-            except Exception as e:
-                logger.warning(f"{strategy.__class__.__name__} failed: {e}")
-                continue
-
-        logger.error("All Twitter strategies failed")
-        return []
+                # 失败或返回空：立即启动下一个
+                if queue:
+                    launch_next()
+            return []
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run_strategy(self, strategy: FetchStrategy, date_range: tuple) -> list[dict]:
+        """执行单个策略并记录耗时；异常视为空结果"""
+        name = strategy.__class__.__name__
+        logger.info(f"Trying {name}...")
+        start = time.monotonic()
+        try:
+            results = await strategy.fetch(self.all_keywords, date_range)
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - start
+            logger.info(f"{name} cancelled after {elapsed:.1f}s")
+            # 输给了对冲的另一个策略：记为耗时更长的截尾样本，下次排序靠后
+            self.stats.record_censored(name, elapsed)
+            raise
+        except Exception as e:
+            self._record(name, start, ok=False)
+            logger.warning(f"{name} failed: {e}")
+            return []
+
+        self._record(name, start, ok=bool(results))
+        if results:
+            logger.info(f"{name} returned {len(results)} items")
+        return results
+
+    def _record(self, name: str, start: float, ok: bool):
+        latency = time.monotonic() - start
+        self.latency[name] = round(latency, 2)
+        self.stats.record(name, latency, ok)
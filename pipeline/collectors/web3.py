@@ -1,38 +1,65 @@
 """Web3 数据采集（轻量）"""
 
+import asyncio
+import json
 import logging
+import time
 from datetime import datetime
+from pathlib import Path
 
 import httpx
 from bs4 import BeautifulSoup
 
+from pipeline.collectors.http_cache import HttpCache, cached_get
+from pipeline.collectors.http_client import use_client
+from pipeline.storage.odds_store import OddsStore
+
 logger = logging.getLogger(__name__)
 
 
 class Web3Collector:
 
-    def __init__(self, config):
+    # Polymarket 按 24h 成交量分页拉取的页数 / 每页条数
+    POLYMARKET_PAGES = 3
+    POLYMARKET_PAGE_SIZE = 100
+
+    def __init__(self, config, http_cache: HttpCache | None = None, client: httpx.AsyncClient | None = None,
+                 now: datetime | None = None):
+        """now: 本次运行时间（回放时固定为录制当天），作为 Polymarket 价格的记录时间"""
         self.config = config
+        self.now = now
+        self.http_cache = http_cache
+        self.client = client
+        self.source_deadline = config.web3_source_deadline
 
     async def collect(self) -> dict:
-        quests = await self._collect_quests()
-        markets = await self._collect_polymarket()
-        return {"quests": quests, "markets": markets}
-
-    async def _collect_quests(self) -> list[dict]:
-        """采集撸毛机会（多平台聚合）"""
-        results = []
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            # Galxe 热门活动
-            galxe = await self._fetch_galxe(client)
-            results.extend(galxe)
+        """并发采集各数据源，每个源单独限时
+
+        超时的源记入 meta["degraded_modules"]，不拖慢整体采集；
+        各源耗时（秒）记入 meta["source_latency"]。
+        """
+        meta = {"degraded_modules": [], "source_latency": {}}
+        async with use_client(self.client, timeout=30) as client:
+            galxe, layer3, markets = await asyncio.gather(
+                self._run_source("galxe", self._fetch_galxe(client), meta),
+                self._run_source("layer3", self._fetch_layer3(client), meta),
+                self._run_source("polymarket", self._fetch_polymarket(client), meta),
+            )
 
-            # Layer3 任务
-            layer3 = await self._fetch_layer3(client)
-            results.extend(layer3)
+        # 撸毛机会（多平台聚合），最多 5 条
+        quests = (galxe + layer3)[:5]
+        return {"quests": quests, "markets": markets, "meta": meta}
 
-        return results[:5]  # 最多 5 条
+    async def _run_source(self, name: str, coro, meta: dict) -> list[dict]:
+        start = time.monotonic()
+        try:
+            return await asyncio.wait_for(coro, self.source_deadline)
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} exceeded {self.source_deadline}s deadline, skipped")
+            meta["degraded_modules"].append(name)
+            return []
+        finally:
+            meta["source_latency"][name] = round(time.monotonic() - start, 2)
 
     async def _fetch_galxe(self, client: httpx.AsyncClient) -> list[dict]:
         """抓取 Galxe 热门活动"""
@@ -87,8 +114,10 @@ class Web3Collector:
     async def _fetch_layer3(self, client: httpx.AsyncClient) -> list[dict]:
         """抓取 Layer3 任务"""
         try:
-            resp = await client.get(
+            resp = await cached_get(
+                client,
                 "https://layer3.xyz/api/quests",
+                self.http_cache,
                 params={"limit": 5, "sort": "trending"},
             )
             if resp.status_code != 200:
@@ -112,38 +141,95 @@ class Web3Collector:
             logger.warning(f"Layer3 fetch failed: {e}")
             return []
 
-    async def _collect_polymarket(self) -> list[dict]:
-        """采集 Polymarket 热门市场"""
+    async def _fetch_polymarket(self, client: httpx.AsyncClient) -> list[dict]:
+        """采集 Polymarket 热门市场
+
+        按 24h 成交量分页拉取前 POLYMARKET_PAGES 页再筛选 AI/Tech 相关；
+        所有拉到的市场价格写入 OddsStore，odds_change 由历史价格索引查询得出。
+        """
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.get(
-                    "https://gamma-api.polymarket.com/markets",
-                    params={
-                        "limit": 10,
-                        "active": True,
-                        "order": "volume24hr",
-                        "ascending": False,
-                    },
-                )
-                if resp.status_code != 200:
-                    return []
-
-                markets = resp.json()
+            pages = await asyncio.gather(*(
+                self._fetch_polymarket_page(client, page * self.POLYMARKET_PAGE_SIZE)
+                for page in range(self.POLYMARKET_PAGES)
+            ))
+            markets = [m for page in pages for m in page]
+            if not markets:
+                return []
+
+            store = OddsStore(str(Path(self.config.data_dir) / "polymarket_odds.db"))
+            try:
+                now = int(self.now.timestamp()) if self.now else int(time.time())
+                prices = {}
+                for m in markets:
+                    price = self._market_price(m)
+                    if m.get("slug") and price is not None:
+                        prices[m["slug"]] = price
+
                 # 筛选 AI/Tech 相关
                 ai_keywords = ["ai", "artificial intelligence", "coding", "programming", "tech"]
                 filtered = []
+                seen = set()
                 for m in markets:
+                    slug = m.get("slug", "")
+                    if slug in seen:
+                        continue
+                    seen.add(slug)
                     question = (m.get("question", "") + m.get("description", "")).lower()
                     if any(kw in question for kw in ai_keywords):
+                        price = prices.get(slug)
                         filtered.append({
                             "title": m.get("question", ""),
                             "summary": m.get("description", "")[:120],
                             "volume": f"${int(m.get('volume24hr', 0)):,}",
-                            "odds_change": None,
-                            "url": f"https://polymarket.com/event/{m.get('slug', '')}",
+                            "odds_change": store.format_change(slug, price, now) if price is not None else None,
+                            "url": f"https://polymarket.com/event/{slug}",
                         })
 
-                return filtered[:2]
+                # 先算变化再写入，避免当前价格参与查询
+                store.record(prices, now)
+            finally:
+                store.close()
+
+            return filtered[:2]
         except Exception as e:
             logger.warning(f"Polymarket fetch failed: {e}")
             return []
+
+    async def _fetch_polymarket_page(self, client: httpx.AsyncClient, offset: int) -> list[dict]:
+        try:
+            resp = await cached_get(
+                client,
+                "https://gamma-api.polymarket.com/markets",
+                self.http_cache,
+                params={
+                    "limit": self.POLYMARKET_PAGE_SIZE,
+                    "offset": offset,
+                    "active": True,
+                    "order": "volume24hr",
+                    "ascending": False,
+                },
+            )
+            if resp.status_code != 200:
+                return []
+            data = resp.json()
+            return data if isinstance(data, list) else []
+        except Exception as e:
+            logger.warning(f"Polymarket page at offset {offset} failed: {e}")
+            return []
+
+    def _market_price(self, market: dict) -> float | None:
+        """首个 outcome（通常为 Yes）的价格；outcomePrices 是 JSON 字符串，如 '["0.35", "0.65"]'"""
+        prices = market.get("outcomePrices")
+        if isinstance(prices, str):
+            try:
+                prices = json.loads(prices)
+            except ValueError:
+                prices = None
+        try:
+            if prices:
+                return float(prices[0])
+            if market.get("lastTradePrice") is not None:
+                return float(market["lastTradePrice"])
+        except (TypeError, ValueError):
+            pass
+        return None
@@ -9,6 +9,46 @@ class Config:
     dashscope_api_key: str = ""
     github_token: str = ""
 
+    # GitHub API 补充信息：并发上限 & 常规补充数量（额度富余时会超出）
+    github_api_concurrency: int = 8
+    github_enrich_limit: int = 20
+    # 补充信息后端："graphql"（需 token，批量查询）| "rest"
+    github_enrich_backend: str = "graphql"
+
+    # Trending 抓取矩阵：语言（"" 为全部语言）× 周期（daily / weekly / monthly），并发抓取
+    github_trending_languages: list = field(default_factory=lambda: ["", "python", "typescript", "rust"])
+    github_trending_periods: list = field(default_factory=lambda: ["daily"])
+    # Trending 页面解析后端："lxml"（快速）| "bs4"（参考实现）
+    github_trending_parser: str = "lxml"
+
+    # 磁盘 HTTP 条件请求缓存上限（MB），0 为关闭
+    http_cache_max_mb: int = 50
+
+    # 共享连接池：HTTP/2、全局在途上限、每个 host 在途上限
+    http2: bool = True
+    http_max_connections: int = 32
+    http_per_host_connections: int = 8
+
+    # X/Twitter 采集（Apify / SocialData 共用 key）
+    twitter_scraper_key: str = ""
+    twitter_keywords: dict = field(default_factory=lambda: {
+        "coding": ["Claude Code", "Cursor", "Copilot", "Codex", "coding agent"],
+        "models": ["OpenAI", "Anthropic", "Gemini", "DeepSeek", "Qwen"],
+        "tools": ["MCP", "LangGraph", "AI agent"],
+    })
+    # 对冲执行：当前策略超过该秒数未返回即并行启动下一个，0 为严格顺序执行
+    # Apify run 正常要 1~3 分钟（上限 RUN_TIMEOUT=300s），延迟太短几乎每次都会对冲、重复计费；
+    # 120s 约为正常 run 的上沿，超过它基本意味着这次 run 卡住了
+    twitter_hedge_delay: float = 120.0
+    # 增量抓取往回重叠的小时数：这段时间内已抓过的帖子会被重新抓到，刷新互动数
+    twitter_refetch_overlap_hours: float = 6.0
+    # Apify：stream（异步 run + 分页读取 dataset）| sync（run-sync 一次性返回）
+    apify_mode: str = "stream"
+    apify_max_items: int = 100
+
+    # Web3 每个数据源的采集时限（秒），超时记为降级
+    web3_source_deadline: float = 20.0
+
     # Web3 关键词
     web3_keywords: list = field(default_factory=lambda: [
         "airdrop", "points", "testnet", "quest",
@@ -33,9 +73,35 @@ class Config:
 
     @classmethod
     def from_env(cls) -> "Config":
+        defaults = cls()
         return cls(
             dashscope_api_key=os.getenv("DASHSCOPE_API_KEY", ""),
             github_token=os.getenv("GITHUB_TOKEN", ""),
+            github_api_concurrency=int(os.getenv("GITHUB_API_CONCURRENCY", "8")),
+            github_enrich_limit=int(os.getenv("GITHUB_ENRICH_LIMIT", "20")),
+            github_enrich_backend=os.getenv("GITHUB_ENRICH_BACKEND", "graphql"),
+            # 逗号分隔，"all" 表示全部语言，如 GITHUB_TRENDING_LANGUAGES=all,python,go
+            github_trending_languages=_env_list("GITHUB_TRENDING_LANGUAGES", defaults.github_trending_languages),
+            github_trending_periods=_env_list("GITHUB_TRENDING_PERIODS", defaults.github_trending_periods),
+            github_trending_parser=os.getenv("GITHUB_TRENDING_PARSER", "lxml"),
+            twitter_scraper_key=os.getenv("TWITTER_SCRAPER_KEY", ""),
+            twitter_hedge_delay=float(os.getenv("TWITTER_HEDGE_DELAY", "120")),
+            twitter_refetch_overlap_hours=float(os.getenv("TWITTER_REFETCH_OVERLAP_HOURS", "6")),
+            apify_mode=os.getenv("APIFY_MODE", "stream"),
+            apify_max_items=int(os.getenv("APIFY_MAX_ITEMS", "100")),
+            web3_source_deadline=float(os.getenv("WEB3_SOURCE_DEADLINE", "20")),
+            http_cache_max_mb=int(os.getenv("HTTP_CACHE_MAX_MB", "50")),
+            http2=os.getenv("HTTP2", "1") != "0",
+            http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "32")),
+            http_per_host_connections=int(os.getenv("HTTP_PER_HOST_CONNECTIONS", "8")),
             output_dir=os.getenv("OUTPUT_DIR", "output"),
             data_dir=os.getenv("DATA_DIR", "data"),
         )
+
+
+def _env_list(name: str, default: list) -> list:
+    value = os.getenv(name)
+    if not value:
+        return default
+    items = [v.strip().lower() for v in value.split(",") if v.strip()]
+    return ["" if v == "all" else v for v in items]
@@ -42,6 +42,9 @@ class DailyJsonGenerator:
 
         # 序列化
         data = asdict(output)
+        # 关键词命中只在管道内部使用
+        for tweet in data["top_tweets"]:
+            tweet.pop("keyword_hits", None)
         # datetime 对象转字符串
         data = self._serialize_datetimes(data)
 
@@ -1,9 +1,13 @@
 """数据管道入口"""
 
+import argparse
 import asyncio
+import dataclasses
 import logging
+import shutil
 import sys
 import os
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -21,6 +25,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pipeline.config import Config
 from pipeline.collectors.github_trending import GitHubCollector
+from pipeline.collectors.http_cache import HttpCache
+from pipeline.collectors.http_client import create_client, create_pool_transport
+from pipeline.collectors.replay import ReplayBundle, RecordingTransport, ReplayTransport
 from pipeline.collectors.web3 import Web3Collector
 from pipeline.processors.normalizer import Normalizer
 from pipeline.processors.dedup import Deduplicator
@@ -37,11 +44,32 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def run_pipeline():
+def _replay_sandbox(config: Config, date: str) -> Config:
+    """回放用的临时目录：复制一份 data_dir（不含录制和 HTTP 缓存），输出也写到这里
+
+    快照、星数历史、Polymarket 价格库等状态只在副本上读写，不污染生产数据。
+    """
+    root = Path(tempfile.mkdtemp(prefix=f"replay-{date}-"))
+    data_dir = root / "data"
+    if Path(config.data_dir).is_dir():
+        shutil.copytree(config.data_dir, data_dir, ignore=shutil.ignore_patterns("replay", "http_cache"))
+    else:
+        data_dir.mkdir()
+    logger.info(f"Replay sandbox: {root}")
+    return dataclasses.replace(config, data_dir=str(data_dir), output_dir=str(root / "output"))
+
+
+async def run_pipeline(record: bool = False, replay: str | None = None):
+    """record: 录制所有上游响应；replay: 回放指定日期的录制（离线、可重复）"""
     config = Config.from_env()
     denver_tz = pytz.timezone("America/Denver")
-    today = datetime.now(denver_tz)
-    yesterday = today - timedelta(days=1)
+    if replay:
+        # 回放：数据日期固定为录制的那天，运行时间固定为次日 0 点，结果不随回放时间变化
+        yesterday = denver_tz.localize(datetime.strptime(replay, "%Y-%m-%d"))
+        today = yesterday + timedelta(days=1)
+    else:
+        today = datetime.now(denver_tz)
+        yesterday = today - timedelta(days=1)
     date_range = (
         yesterday.replace(hour=0, minute=0, second=0, microsecond=0),
         yesterday.replace(hour=23, minute=59, second=59, microsecond=0),
@@ -56,14 +84,46 @@ async def run_pipeline():
     logger.info("=" * 50)
 
     logger.info("Phase 1: Collecting data...")
-    github_col = GitHubCollector(config)
-    web3_col = Web3Collector(config)
-
-    github_raw, web3_raw = await asyncio.gather(
-        github_col.collect(),
-        web3_col.collect(),
-        return_exceptions=True,
-    )
+    transport = None
+    bundle = None
+    if replay:
+        bundle = ReplayBundle(ReplayBundle.bundle_path(config.data_dir, replay)).load()
+        transport = ReplayTransport(bundle)
+        logger.info(f"Replaying {len(bundle)} recorded responses from {bundle.path}")
+        config = _replay_sandbox(config, replay)
+    elif record:
+        bundle = ReplayBundle(ReplayBundle.bundle_path(config.data_dir, date_str))
+        transport = RecordingTransport(create_pool_transport(config), bundle)
+
+    # 录制 / 回放时不走条件请求缓存，保证录到的都是完整响应
+    http_cache = None
+    if config.http_cache_max_mb > 0 and transport is None:
+        http_cache = HttpCache(
+            Path(config.data_dir) / "http_cache",
+            max_bytes=config.http_cache_max_mb * 1024 * 1024,
+        )
+
+    # 一次运行共用一个连接池，注入所有采集器
+    run_time = today if replay else None
+    async with create_client(config, transport) as client:
+        github_col = GitHubCollector(config, http_cache, client, now=run_time)
+        web3_col = Web3Collector(config, http_cache, client, now=run_time)
+
+        github_raw, web3_raw = await asyncio.gather(
+            github_col.collect(),
+            web3_col.collect(),
+            return_exceptions=True,
+        )
+
+    if record:
+        bundle.save()
+    if replay and transport.misses:
+        logger.warning(f"Replay: {transport.misses} requests were not recorded")
+
+    if http_cache:
+        http_cache.save()
+        meta["http_cache"] = http_cache.report()
+        logger.info(f"HTTP cache: {meta['http_cache']}")
 
     # 处理采集失败
     if isinstance(github_raw, Exception):
@@ -74,6 +134,10 @@ async def run_pipeline():
         logger.error(f"Web3 collection failed: {web3_raw}")
         web3_raw = {"quests": [], "markets": []}
         meta["degraded_modules"].append("web3")
+    else:
+        web3_meta = web3_raw.get("meta", {})
+        meta["degraded_modules"].extend(web3_meta.get("degraded_modules", []))
+        meta["source_latency"] = web3_meta.get("source_latency", {})
 
     if meta["degraded_modules"]:
         meta["degraded"] = True
@@ -94,13 +158,14 @@ async def run_pipeline():
     markets = normalizer.normalize_markets(web3_raw.get("markets", []))
 
     logger.info(f"Normalized: {len(repos_trending)} trending repos, {len(repos_new)} new repos")
+    logger.info(f"Timestamp parsing: {dict(normalizer.time_stats)}")
 
     # ===== 阶段 2.5：更新星数历史 & 生成排行榜 =====
     logger.info("Phase 2.5: Updating star history & generating leaderboards...")
     star_tracker = StarTracker(data_dir=config.data_dir)
     all_repos_raw = github_raw.get("trending", []) + github_raw.get("new", [])
     star_tracker.update(all_repos_raw, date_str)
-    star_tracker.cleanup_old()
+    star_tracker.cleanup_old(today=date_str)
     star_tracker.save()
     leaderboards = star_tracker.generate_leaderboards(top_n=20, today=date_str)
     for period, entries in leaderboards.items():
@@ -136,7 +201,19 @@ async def run_pipeline():
 
 
 def main():
-    asyncio.run(run_pipeline())
+    parser = argparse.ArgumentParser(description="AI / GitHub / Web3 daily data pipeline")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true", help="录制所有上游响应到 data_dir/replay/")
+    mode.add_argument(
+        "--replay", nargs="?", const="yesterday", metavar="DATE",
+        help="回放录制的响应（默认昨天，或指定 YYYY-MM-DD）",
+    )
+    args = parser.parse_args()
+
+    replay = args.replay
+    if replay == "yesterday":
+        replay = (datetime.now(pytz.timezone("America/Denver")) - timedelta(days=1)).strftime("%Y-%m-%d")
+    asyncio.run(run_pipeline(record=args.record, replay=replay))
 
 
 if __name__ == "__main__":
@@ -22,6 +22,8 @@ class Tweet:
     is_ad_suspect: bool = False
     cluster_id: Optional[str] = None
     heat_score: float = 0.0
+    # 标准化时正文命中的关键词（内部使用，不写入输出）；None 表示未扫描
+    keyword_hits: Optional[frozenset] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -42,6 +44,7 @@ class Repo:
     trend_status: str = ""  # "new" | "rising" | "steady" | "declining"
     watchers: int = 0
     open_issues: int = 0
+    trending_pages: list[str] = field(default_factory=list)  # 出现的 trending 页面，如 "python/daily"
 
 
 @dataclass
@@ -53,6 +56,9 @@ class EventCluster:
     keywords: list[str]
     tweet_ids: list[str]
     repo_names: list[str] = field(default_factory=list)
+    first_seen: Optional[str] = None  # 事件首次出现日期（跨天聚类）
+    days_active: int = 1  # 事件出现的天数
+    total_heat: float = 0.0  # 各天热度累计
 
 
 @dataclass
@@ -2,99 +2,101 @@
 
 import re
 import hashlib
-from collections import defaultdict
+from typing import Iterable
 from urllib.parse import urlparse
 
+import numpy as np
+
 from pipeline.models.schemas import Tweet, EventCluster
+from pipeline.processors.corpus import Corpus
+from pipeline.processors.keywords import THEME_KEYWORDS, KeywordHits, get_matcher
+from pipeline.processors.semantic import TfidfGrouper
+from pipeline.storage.cluster_store import ClusterStore
 
 
 class Clusterer:
 
-    THEME_KEYWORDS = {
-        "Coding Agents": ["agent", "agentic", "coding agent", "autonomous", "自主"],
-        "IDE / Copilot Tools": ["cursor", "copilot", "IDE", "editor", "vscode", "编辑器"],
-        "Workflow Automation": ["workflow", "automation", "CI/CD", "pipeline", "自动化"],
-        "Model Releases & Updates": ["released", "launched", "model", "update", "版本", "发布", "模型"],
-        "Tooling / Infra": ["tool", "infra", "framework", "library", "SDK", "MCP"],
-        "Evaluation / Evals": ["eval", "benchmark", "leaderboard", "score", "评测"],
-        "RAG / Retrieval": ["RAG", "retrieval", "embedding", "vector", "检索"],
-        "Demos / New Apps": ["demo", "app", "showcase", "built with", "演示"],
-    }
-
-    # 已知实体（用于实体聚类）
-    KNOWN_ENTITIES = [
-        "claude", "gpt", "gemini", "copilot", "cursor", "codex",
-        "llama", "mistral", "deepseek", "qwen", "anthropic", "openai",
-        "langchain", "langgraph", "vercel", "bolt.new", "browser-use",
-        "mcp", "swe-bench", "alphacode",
-    ]
-
-    def cluster_events(self, tweets: list[Tweet]) -> list[EventCluster]:
+    THEME_KEYWORDS = THEME_KEYWORDS
+
+    def __init__(self, backend: str = "links", similarity: float = 0.5, store: ClusterStore | None = None):
+        self.matcher = get_matcher()
+        # 跨天事件存储：有则推文组优先归入已有事件，沿用其稳定 ID
+        self.store = store
+        # "links"：外链 / 实体聚类；"tfidf"：额外按 TF-IDF 余弦相似度合并（需要 scipy）
+        if backend not in ("links", "tfidf"):
+            raise ValueError(f"Unknown cluster backend: {backend}")
+        self.backend = backend
+        self.similarity = similarity
+        self.grouper = TfidfGrouper(threshold=similarity) if backend == "tfidf" else None
+
+    def cluster_events(self, tweets: Iterable[Tweet]) -> list[EventCluster]:
+        # 聚类需要全部推文，流式输入在此物化（此时已是去重后的标准化推文）
+        tweets = list(tweets)
         if not tweets:
             return []
 
-        # 阶段 1：按共享 URL 分组
-        url_groups, ungrouped = self._group_by_shared_urls(tweets)
-
-        # 阶段 2：按关键实体分组
-        entity_groups, still_ungrouped = self._group_by_entities(ungrouped)
-
-        # 合并所有分组
-        all_groups = url_groups + entity_groups
+        # 全量语料只分词一次，各簇关键词从中按 TF-IDF 取
+        corpus = Corpus(tweets)
 
-        # 每个未分组的推文单独成一个 cluster
-        for tweet in still_ungrouped:
-            all_groups.append([tweet])
+        # 推文 ↔ URL ↔ 实体 并查集，每条推文恰好归入一个连通分量（组内为推文下标）
+        groups = self._group_by_links(tweets)
 
         # 构建 EventCluster 对象
-        clusters = []
-        for i, group in enumerate(all_groups):
-            if not group:
-                continue
-            cluster = self._build_cluster(f"cluster_{i:03d}", group)
-            clusters.append(cluster)
+        if self.store is None:
+            clusters = [
+                self._build_cluster(f"cluster_{i:03d}", [tweets[j] for j in group], corpus.keywords(group))
+                for i, group in enumerate(groups)
+            ]
+        else:
+            signatures = [self._signature(tweets, group, corpus) for group in groups]
+            clusters = []
+            for cluster_id, group, (terms, urls) in zip(self.store.assign(signatures), groups, signatures):
+                cluster = self._build_cluster(cluster_id, [tweets[j] for j in group], corpus.keywords(group))
+                self.store.update(cluster, terms, urls)
+                clusters.append(cluster)
 
         # 按热度排序
         clusters.sort(key=lambda c: c.heat_score, reverse=True)
         return clusters
 
-    def _group_by_shared_urls(self, tweets: list[Tweet]):
-        """按共享外链分组"""
-        url_to_tweets: dict[str, list[Tweet]] = defaultdict(list)
-        ungrouped = []
-
-        for tweet in tweets:
-            matched = False
-            for url in tweet.urls:
-                normalized = self._normalize_url(url)
-                if normalized:
-                    url_to_tweets[normalized].append(tweet)
-                    matched = True
-            if not matched:
-                ungrouped.append(tweet)
-
-        groups = [group for group in url_to_tweets.values() if len(group) >= 1]
-        return groups, ungrouped
-
-    def _group_by_entities(self, tweets: list[Tweet]):
-        """按关键实体分组"""
-        entity_to_tweets: dict[str, list[Tweet]] = defaultdict(list)
-        ungrouped = []
-
-        for tweet in tweets:
-            text_lower = tweet.text.lower()
-            matched_entities = [
-                e for e in self.KNOWN_ENTITIES if e in text_lower
-            ]
-            if matched_entities:
-                # 用第一个匹配的实体作为 key
-                primary = matched_entities[0]
-                entity_to_tweets[primary].append(tweet)
-            else:
-                ungrouped.append(tweet)
-
-        groups = list(entity_to_tweets.values())
-        return groups, ungrouped
+    def _group_by_links(self, tweets: list[Tweet]) -> list[list[int]]:
+        """共享外链的推文合并；没有可用外链的推文按主实体（第一个命中）合并；
+        tfidf 后端下文本相似的推文也合并
+
+        链接可传递：A、B 共享 url1，B、C 共享 url2，则 A、B、C 同组。
+        分组顺序按组内第一条推文出现的顺序。
+        """
+        n = len(tweets)
+        dsu = DisjointSet(n)
+        # URL / 实体节点编号接在推文之后
+        nodes: dict[tuple[str, str], int] = {}
+
+        def link(i: int, key: tuple[str, str]):
+            node = nodes.get(key)
+            if node is None:
+                node = nodes[key] = dsu.add()
+            dsu.union(i, node)
+
+        for i, tweet in enumerate(tweets):
+            urls = [u for u in map(self._normalize_url, tweet.urls) if u]
+            for url in urls:
+                link(i, ("url", url))
+            if not urls:
+                entities = self.matcher.tweet_hits(tweet).labels("entities")
+                if entities:
+                    link(i, ("entity", entities[0]))
+
+        if self.grouper is not None:
+            labels = self.grouper.components([t.text for t in tweets])
+            sizes = np.bincount(labels)
+            for i, label in enumerate(labels.tolist()):
+                if sizes[label] > 1:
+                    link(i, ("topic", str(label)))
+
+        groups: dict[int, list[int]] = {}
+        for i in range(n):
+            groups.setdefault(dsu.find(i), []).append(i)
+        return list(groups.values())
 
     def _normalize_url(self, url: str) -> str:
         """URL 标准化：去掉 query 参数和 fragment"""
@@ -107,16 +109,11 @@ class Clusterer:
         except Exception:
             return ""
 
-    def _build_cluster(self, cluster_id: str, tweets: list[Tweet]) -> EventCluster:
-        """从一组推文构建 EventCluster"""
-        # 合并文本用于主题归类
-        combined_text = " ".join(t.text for t in tweets)
-
-        # 提取关键词（简单词频）
-        keywords = self._extract_keywords(combined_text)
-
-        # 归类主题
-        theme = self._assign_theme(combined_text)
+    def _build_cluster(self, cluster_id: str, tweets: list[Tweet], keywords: list[str]) -> EventCluster:
+        """从一组推文构建 EventCluster；keywords 为语料 TF-IDF 关键词"""
+        # 归类主题：合并组内各推文标准化时的关键词命中
+        hits = KeywordHits.union(self.matcher, [self.matcher.tweet_hits(t) for t in tweets])
+        theme = self._assign_theme(hits)
 
         # 生成标题
         title = self._generate_title(tweets, keywords)
@@ -152,38 +149,19 @@ class Clusterer:
             keywords=keywords[:8],
             tweet_ids=[t.id for t in tweets[:3]],  # 代表推文最多 3 条
             repo_names=repo_names,
+            total_heat=round(heat_score, 1),
         )
 
-    def _assign_theme(self, text: str) -> str:
-        scores = {}
-        text_lower = text.lower()
-        for theme, keywords in self.THEME_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw.lower() in text_lower)
-            scores[theme] = score
+    def _assign_theme(self, hits: KeywordHits) -> str:
+        scores = {theme: hits.count("themes", theme) for theme in self.THEME_KEYWORDS}
         best = max(scores, key=scores.get)
         return best if scores[best] > 0 else "Demos / New Apps"
 
-    def _extract_keywords(self, text: str, top_n: int = 8) -> list[str]:
-        """简单关键词提取：词频统计"""
-        stop_words = {
-            "the", "a", "an", "is", "are", "was", "were", "be", "been",
-            "have", "has", "had", "do", "does", "did", "will", "would",
-            "could", "should", "may", "might", "can", "shall", "to", "of",
-            "in", "for", "on", "with", "at", "by", "from", "as", "into",
-            "through", "during", "before", "after", "and", "but", "or",
-            "not", "no", "so", "if", "than", "too", "very", "just",
-            "about", "up", "out", "that", "this", "it", "its", "i",
-            "my", "your", "we", "they", "he", "she", "you", "me",
-            "的", "了", "在", "是", "我", "有", "和", "就", "不", "人",
-            "都", "一", "一个", "上", "也", "很", "到", "说", "要", "去",
-        }
-        words = re.findall(r"[a-zA-Z]{3,}|[\u4e00-\u9fff]{2,}", text.lower())
-        freq: dict[str, int] = {}
-        for w in words:
-            if w not in stop_words:
-                freq[w] = freq.get(w, 0) + 1
-        sorted_words = sorted(freq, key=freq.get, reverse=True)
-        return sorted_words[:top_n]
+    def _signature(self, tweets: list[Tweet], group: list[int], corpus: Corpus) -> tuple[dict[str, float], set[str]]:
+        """推文组的跨天匹配签名：TF-IDF 关键词权重 + 标准化外链"""
+        terms = dict(corpus.top_terms(group, ClusterStore.SIGNATURE_SIZE))
+        urls = {u for j in group for u in map(self._normalize_url, tweets[j].urls) if u}
+        return terms, urls
 
     def _generate_title(self, tweets: list[Tweet], keywords: list[str]) -> str:
         """生成 cluster 标题：取第一条推文的前 50 字符 + 关键词"""
@@ -193,3 +171,33 @@ class Clusterer:
                 first_text += "..."
             return first_text
         return " / ".join(keywords[:3])
+
+
+class DisjointSet:
+    """并查集：按大小合并 + 路径减半，近似线性时间"""
+
+    def __init__(self, n: int = 0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
@@ -0,0 +1,71 @@
+"""当日推文语料：一次分词，缓存每条推文的词 ID，文档频率只算一次
+
+簇关键词 = 组内词频 × 语料 IDF 的 top-k，只需对预先算好的词 ID 计数。
+"""
+
+import re
+
+import numpy as np
+
+from pipeline.models.schemas import Tweet
+
+_WORD_RE = re.compile(r"[a-zA-Z]{3,}|[\u4e00-\u9fff]{2,}")
+
+STOP_WORDS = {
+    "the", "a", "an", "is", "are", "was", "were", "be", "been",
+    "have", "has", "had", "do", "does", "did", "will", "would",
+    "could", "should", "may", "might", "can", "shall", "to", "of",
+    "in", "for", "on", "with", "at", "by", "from", "as", "into",
+    "through", "during", "before", "after", "and", "but", "or",
+    "not", "no", "so", "if", "than", "too", "very", "just",
+    "about", "up", "out", "that", "this", "it", "its", "i",
+    "my", "your", "we", "they", "he", "she", "you", "me",
+    "的", "了", "在", "是", "我", "有", "和", "就", "不", "人",
+    "都", "一", "一个", "上", "也", "很", "到", "说", "要", "去",
+}
+
+
+class Corpus:
+    """按推文顺序编号（0..n-1）的语料
+
+    所有推文的词 ID 拼成一个扁平数组，offsets[i]:offsets[i+1] 为第 i 条推文的词。
+    词 ID 按首次出现顺序分配，同分时靠前出现的词优先。
+    """
+
+    def __init__(self, tweets: list[Tweet]):
+        vocab: dict[str, int] = {}
+        ids: list[int] = []
+        offsets = [0]
+        for tweet in tweets:
+            for word in _WORD_RE.findall(tweet.text.lower()):
+                if word not in STOP_WORDS:
+                    ids.append(vocab.setdefault(word, len(vocab)))
+            offsets.append(len(ids))
+
+        self.terms = list(vocab)
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+        # 文档频率：每条推文内去重后计数
+        n = len(tweets)
+        doc_of = np.repeat(np.arange(n), np.diff(self.offsets))
+        pairs = np.unique(doc_of.astype(np.int64) * max(len(vocab), 1) + self.ids)
+        df = np.bincount(pairs % max(len(vocab), 1), minlength=len(vocab))
+        self.idf = np.log((1 + n) / (1 + df)) + 1
+
+    def _counts(self, docs: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """一组推文的 (词 ID, 词频)"""
+        ids = np.concatenate([self.ids[self.offsets[d]:self.offsets[d + 1]] for d in docs]) if docs else self.ids[:0]
+        return np.unique(ids, return_counts=True)
+
+    def top_terms(self, docs: list[int], k: int) -> list[tuple[str, float]]:
+        """TF-IDF 最高的 k 个词及其权重"""
+        ids, counts = self._counts(docs)
+        if not len(ids):
+            return []
+        scores = counts * self.idf[ids]
+        order = np.lexsort((ids, -scores))[:k]
+        return [(self.terms[ids[i]], float(scores[i])) for i in order]
+
+    def keywords(self, docs: list[int], k: int = 8) -> list[str]:
+        return [term for term, _ in self.top_terms(docs, k)]
@@ -1,65 +1,238 @@
 """去重处理器：基于 URL 和文本相似度去重"""
 
+import re
 import hashlib
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+import numpy as np
+
 from pipeline.models.schemas import Tweet
+from pipeline.storage.dedup_index import CrossDayIndex, simhash_bands, url_set_hash
 
 
 class Deduplicator:
-    """推文去重：URL 精确去重 + SimHash 近似去重"""
+    """推文去重：URL 精确去重 + SimHash / MinHash 近似去重"""
 
     SIMHASH_THRESHOLD = 3  # 海明距离阈值
+    BATCH_SIZE = 1024  # 批量计算指纹的条数
+
+    def __init__(self, history: CrossDayIndex | None = None, backend: str = "simhash"):
+        # 跨天索引：前几天已保留过的推文直接判重（始终按 SimHash 指纹）
+        self.history = history
+        # 当日近似去重后端："simhash"（海明距离）或 "minhash"（Jaccard，LSH 分桶）
+        if backend not in ("simhash", "minhash"):
+            raise ValueError(f"Unknown dedup backend: {backend}")
+        self.backend = backend
+        self.minhasher = MinHasher() if backend == "minhash" else None
+        self.reset()
+
+    def reset(self):
+        """清空已见状态；每次 dedup / iter_dedup 开始时调用"""
+        self.seen_urls: set[frozenset] = set()
+        if self.backend == "minhash":
+            self.seen_hashes = MinHashLSH(self.minhasher.num_perm)
+        else:
+            self.seen_hashes = SimHashIndex(self.SIMHASH_THRESHOLD)
 
     def dedup(self, tweets: list[Tweet]) -> list[Tweet]:
-        seen_urls: set[frozenset] = set()
-        seen_hashes: list[int] = []
-        result = []
+        return list(self.iter_dedup(tweets))
+
+    def iter_dedup(self, tweets: Iterable[Tweet]) -> Iterator[Tweet]:
+        """流式去重：只保留 URL 集合和文本指纹，不持有推文本身
 
+        每攒够 BATCH_SIZE 条批量计算一次指纹。
+        """
+        self.reset()
+        batch: list[Tweet] = []
         for tweet in tweets:
-            # 1. URL 去重
-            tweet_urls = frozenset(tweet.urls)
-            if tweet_urls and tweet_urls in seen_urls:
-                continue
+            batch.append(tweet)
+            if len(batch) >= self.BATCH_SIZE:
+                yield from self.accept_batch(batch)
+                batch = []
+        if batch:
+            yield from self.accept_batch(batch)
 
-            # 2. 文本 SimHash 去重
-            text_hash = self._simhash(tweet.text)
-            is_dup = any(
-                self._hamming_distance(text_hash, h) <= self.SIMHASH_THRESHOLD
-                for h in seen_hashes
-            )
-            if is_dup:
-                continue
+    def accept_batch(self, batch: list[Tweet]) -> Iterator[Tweet]:
+        """一批推文批量算指纹，再按顺序逐条判重；产出保留的推文"""
+        texts = [t.text for t in batch]
+        fingerprints = simhash_batch(texts).tolist()
+        signatures = self.minhasher.signatures(texts) if self.minhasher else fingerprints
+        for tweet, fingerprint, signature in zip(batch, fingerprints, signatures):
+            if self.accept(tweet, fingerprint, signature):
+                yield tweet
+
+    def accept(self, tweet: Tweet, fingerprint: int | None = None, signature=None) -> bool:
+        """判断推文是否为新内容；是则记入已见状态"""
+        # 1. URL 去重
+        tweet_urls = frozenset(tweet.urls)
+        if tweet_urls and tweet_urls in self.seen_urls:
+            return False
+        urls_hash = url_set_hash(tweet_urls) if self.history else 0
+        if self.history and self.history.contains_urls(urls_hash):
+            return False
+
+        # 2. 文本近似去重
+        text_hash = fingerprint if fingerprint is not None else self._simhash(tweet.text)
+        if signature is None:
+            signature = self.minhasher.signatures([tweet.text])[0] if self.minhasher else text_hash
+        if self.seen_hashes.contains_near(signature):
+            return False
+        if self.history and self.history.contains_near(text_hash):
+            return False
 
-            if tweet_urls:
-                seen_urls.add(tweet_urls)
-            seen_hashes.append(text_hash)
-            result.append(tweet)
-
-        return result
-
-    def _simhash(self, text: str, hashbits: int = 64) -> int:
-        """简易 SimHash 实现（不依赖外部库的降级方案）"""
-        tokens = text.lower().split()
-        v = [0] * hashbits
-
-        for token in tokens:
-            token_hash = int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16)
-            for i in range(hashbits):
-                bitmask = 1 << i
-                if token_hash & bitmask:
-                    v[i] += 1
-                else:
-                    v[i] -= 1
-
-        fingerprint = 0
-        for i in range(hashbits):
-            if v[i] >= 0:
-                fingerprint |= 1 << i
-        return fingerprint
+        if tweet_urls:
+            self.seen_urls.add(tweet_urls)
+        self.seen_hashes.add(signature)
+        if self.history:
+            self.history.add(text_hash, urls_hash)
+        return True
+
+    def _simhash(self, text: str) -> int:
+        return int(simhash_batch([text])[0])
 
     def _hamming_distance(self, a: int, b: int) -> int:
-        x = a ^ b
-        count = 0
-        while x:
-            count += 1
-            x &= x - 1
-        return count
+        return (a ^ b).bit_count()
+
+
+class SimHashIndex:
+    """64 位指纹的近邻索引（多索引 / 抽屉原理分段）
+
+    把指纹切成 threshold + 1 段，海明距离 ≤ threshold 的两个指纹至少有一段完全相同。
+    每段一张哈希表，查询时只取各段同值的候选再精确比对，查询近似常数时间。
+    阈值 3 即 4 段 × 16 位。
+    """
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = threshold
+        self._bands = simhash_bands(threshold)
+        self._tables: list[dict[int, list[int]]] = [{} for _ in self._bands]
+        self._size = 0
+
+    def _keys(self, fingerprint: int) -> list[int]:
+        return [(fingerprint >> shift) & mask for shift, mask in self._bands]
+
+    def add(self, fingerprint: int):
+        for table, key in zip(self._tables, self._keys(fingerprint)):
+            table.setdefault(key, []).append(fingerprint)
+        self._size += 1
+
+    def contains_near(self, fingerprint: int) -> bool:
+        for table, key in zip(self._tables, self._keys(fingerprint)):
+            for candidate in table.get(key, ()):
+                if (candidate ^ fingerprint).bit_count() <= self.threshold:
+                    return True
+        return False
+
+    def __len__(self) -> int:
+        return self._size
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    """64 位 token 哈希（blake2b, digest_size=8）"""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# 中日韩文字：无空格分词，按字符 n-gram 切分
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+# 全角标点与空白一样视为分隔符
+_CJK_PUNCT = "\u3000-\u303f\uff00-\uff0f\uff1a-\uff20\uff3b-\uff40\uff5b-\uff65"
+_TOKEN_RE = re.compile(f"[{_CJK}]+|[^\\s{_CJK}{_CJK_PUNCT}]+")
+_CJK_RE = re.compile(f"[{_CJK}]")
+
+CJK_NGRAM = 2
+
+
+def tokenize(text: str) -> list[str]:
+    """按文字类型选分词方式：拉丁等按空白分词，中日韩连续片段切字符 bigram"""
+    tokens = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if _CJK_RE.match(run) and len(run) > CJK_NGRAM:
+            tokens.extend(run[i:i + CJK_NGRAM] for i in range(len(run) - CJK_NGRAM + 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def simhash_batch(texts: list[str]) -> np.ndarray:
+    """一批文本的 64 位 SimHash，返回 uint64 数组
+
+    所有 token 哈希展开成 (token 数, 64) 的位矩阵，按文本分段求 ±1 之和，
+    每一位之和 ≥ 0 则该位为 1（无 token 的文本得到全 1 指纹）。
+    """
+    token_lists = [tokenize(text) for text in texts]
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(texts))
+    hashes = np.fromiter(
+        (_token_hash(token) for tokens in token_lists for token in tokens),
+        dtype=np.uint64,
+        count=int(lengths.sum()),
+    )
+
+    # 第 k 列即哈希值的第 k 位
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    signed = bits.astype(np.int32) * 2 - 1
+
+    sums = np.zeros((len(texts), 64), dtype=np.int32)
+    nonempty = lengths > 0
+    if nonempty.any():
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        sums[nonempty] = np.add.reduceat(signed, offsets[nonempty], axis=0)
+
+    packed = np.packbits(sums >= 0, axis=1, bitorder="little")
+    return packed.view("<u8").reshape(-1).astype(np.uint64)
+
+
+class MinHasher:
+    """MinHash 签名：num_perm 个 xor-乘法哈希函数在 token 集合上取最小值"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._xor = rng.integers(0, 2**63, num_perm, dtype=np.uint64) << np.uint64(1)
+        # 奇数乘子，乘法按 2^64 回绕
+        self._mul = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+    def signatures(self, texts: list[str]) -> np.ndarray:
+        """(文本数, num_perm) 的 uint64 签名矩阵；无 token 的文本签名全为最大值"""
+        sigs = np.full((len(texts), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        for row, text in enumerate(texts):
+            tokens = {_token_hash(token) for token in tokenize(text)}
+            if not tokens:
+                continue
+            hashes = np.fromiter(tokens, dtype=np.uint64, count=len(tokens))
+            sigs[row] = ((hashes[:, None] ^ self._xor) * self._mul).min(axis=0)
+        return sigs
+
+
+class MinHashLSH:
+    """MinHash 签名的 LSH 索引：签名切成 bands 段，每段一张桶表
+
+    同桶的候选再用签名估计的 Jaccard 相似度精确过滤。
+    64 个哈希 / 16 段时相似度约 0.5 以上大概率落入同桶。
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6):
+        self.rows = num_perm // bands
+        self.bands = bands
+        self.threshold = threshold
+        self._tables: list[dict[bytes, list[np.ndarray]]] = [{} for _ in range(bands)]
+        self._size = 0
+
+    def _keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, signature: np.ndarray):
+        for table, key in zip(self._tables, self._keys(signature)):
+            table.setdefault(key, []).append(signature)
+        self._size += 1
+
+    def contains_near(self, signature: np.ndarray) -> bool:
+        for table, key in zip(self._tables, self._keys(signature)):
+            for candidate in table.get(key, ()):
+                if np.count_nonzero(candidate == signature) / len(signature) >= self.threshold:
+                    return True
+        return False
+
+    def __len__(self) -> int:
+        return self._size
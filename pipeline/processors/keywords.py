@@ -0,0 +1,220 @@
+"""关键词表 + 多模式匹配自动机（Aho-Corasick）
+
+Normalizer / Ranker / Clusterer 用到的所有关键词表编译进同一个自动机，
+每段文本只扫描一遍即得到全部命中；推文的命中在标准化时挂到 Tweet.keyword_hits 上，各阶段共享。
+"""
+
+from collections import defaultdict, deque
+from functools import lru_cache
+
+
+# 推文内容标签（顺序即输出顺序）
+TWEET_TAG_KEYWORDS = {
+    "发布": ["released", "launched", "发布", "上线", "announcing"],
+    "教程": ["tutorial", "教程", "how to", "guide", "step by step"],
+    "repo": ["github.com"],
+    "demo": ["demo", "演示", "showcase", "built with"],
+    "观点": ["opinion", "观点", "i think", "hot take", "我认为"],
+    "工具更新": ["update", "更新", "v0.", "v1.", "v2.", "changelog"],
+    "模型更新": ["model", "模型", "gpt", "claude", "gemini", "llama"],
+}
+
+# 广告信号：命中 ≥ 2 个视为疑似广告
+AD_SIGNALS = [
+    "referral", "promo code", "discount", "合约地址",
+    "airdrop claim", "limited time", "返佣",
+    "use my link", "sign up with", "exclusive offer",
+    "free tokens", "whitelist spot",
+]
+
+# repo 描述 / topics 标签
+REPO_TAG_KEYWORDS = {
+    "coding agent": ["agent", "coding agent", "agentic"],
+    "IDE": ["ide", "editor", "copilot", "cursor"],
+    "workflow": ["workflow", "automation", "ci/cd", "pipeline"],
+    "eval": ["eval", "benchmark", "leaderboard"],
+    "RAG": ["rag", "retrieval", "embedding", "vector"],
+    "tooling": ["tool", "framework", "library", "sdk", "infra"],
+}
+
+# 大厂关键词 — 命中则加权
+BIG_LAB_KEYWORDS = [
+    "openai", "gpt-5", "gpt-4o", "o1", "o3", "o4",
+    "anthropic", "claude", "sonnet", "opus",
+    "google", "gemini", "deepmind",
+    "meta", "llama",
+    "mistral",
+    "deepseek",
+    "xai", "grok",
+    "sora", "dall-e",
+    "sam altman", "dario amodei", "demis hassabis",
+]
+
+THEME_KEYWORDS = {
+    "Coding Agents": ["agent", "agentic", "coding agent", "autonomous", "自主"],
+    "IDE / Copilot Tools": ["cursor", "copilot", "IDE", "editor", "vscode", "编辑器"],
+    "Workflow Automation": ["workflow", "automation", "CI/CD", "pipeline", "自动化"],
+    "Model Releases & Updates": ["released", "launched", "model", "update", "版本", "发布", "模型"],
+    "Tooling / Infra": ["tool", "infra", "framework", "library", "SDK", "MCP"],
+    "Evaluation / Evals": ["eval", "benchmark", "leaderboard", "score", "评测"],
+    "RAG / Retrieval": ["RAG", "retrieval", "embedding", "vector", "检索"],
+    "Demos / New Apps": ["demo", "app", "showcase", "built with", "演示"],
+}
+
+# 已知实体（用于实体聚类），列表靠前的优先作为主实体
+KNOWN_ENTITIES = [
+    "claude", "gpt", "gemini", "copilot", "cursor", "codex",
+    "llama", "mistral", "deepseek", "qwen", "anthropic", "openai",
+    "langchain", "langgraph", "vercel", "bolt.new", "browser-use",
+    "mcp", "swe-bench", "alphacode",
+]
+
+
+def _flat(keywords: list[str]) -> dict[str, list[str]]:
+    """平铺列表：每个关键词自成一个 label"""
+    return {kw: [kw] for kw in keywords}
+
+
+KEYWORD_TABLES = {
+    "tweet_tags": TWEET_TAG_KEYWORDS,
+    "ad_signals": _flat(AD_SIGNALS),
+    "repo_tags": REPO_TAG_KEYWORDS,
+    "big_lab": _flat(BIG_LAB_KEYWORDS),
+    "themes": THEME_KEYWORDS,
+    "entities": _flat(KNOWN_ENTITIES),
+}
+
+
+class _Automaton:
+    """纯 Python Aho-Corasick：trie + 失配链接，一趟扫描输出所有（可重叠的）命中模式"""
+
+    def __init__(self, patterns: list[str]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[tuple[str, ...]] = [()]
+
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] += (pattern,)
+
+        # BFS 建失配链接，并把失配链上的输出合并进来
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def matches(self, text: str) -> set[str]:
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class _NativeAutomaton:
+    """pyahocorasick 后端（C 实现），安装了就用"""
+
+    def __init__(self, patterns: list[str]):
+        import ahocorasick
+
+        self._automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            self._automaton.add_word(pattern, pattern)
+        self._automaton.make_automaton()
+
+    def matches(self, text: str) -> set[str]:
+        return {pattern for _, pattern in self._automaton.iter(text)}
+
+
+def _ahocorasick_available() -> bool:
+    try:
+        import ahocorasick  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class KeywordHits:
+    """一段文本的全部命中，按 关键词表 → label → 命中关键词 组织"""
+
+    def __init__(self, matcher: "KeywordMatcher", patterns: frozenset[str]):
+        self.patterns = patterns
+        self._matcher = matcher
+        self._groups: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+        for pattern in patterns:
+            for group, label in matcher.index[pattern]:
+                self._groups[group][label].add(pattern)
+
+    def labels(self, group: str) -> list[str]:
+        """命中的 label，按关键词表中的顺序"""
+        found = self._groups.get(group, {})
+        return [label for label in self._matcher.tables[group] if label in found]
+
+    def keywords(self, group: str, label: str | None = None) -> set[str]:
+        found = self._groups.get(group, {})
+        if label is not None:
+            return found.get(label, set())
+        return set().union(*found.values())
+
+    def count(self, group: str, label: str | None = None) -> int:
+        """命中的不同关键词数"""
+        return len(self.keywords(group, label))
+
+    @classmethod
+    def union(cls, matcher: "KeywordMatcher", hits: list["KeywordHits"]) -> "KeywordHits":
+        return cls(matcher, frozenset().union(*(h.patterns for h in hits)))
+
+
+class KeywordMatcher:
+    """由多张关键词表编译出的单个自动机；匹配不区分大小写，语义同 `kw in text.lower()`"""
+
+    def __init__(self, tables: dict[str, dict[str, list[str]]], cache_size: int = 8192):
+        self.tables = tables
+        self.index: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for group, labels in tables.items():
+            for label, keywords in labels.items():
+                for kw in keywords:
+                    self.index[kw.lower()].append((group, label))
+
+        patterns = list(self.index)
+        if _ahocorasick_available():
+            self._automaton = _NativeAutomaton(patterns)
+        else:
+            self._automaton = _Automaton(patterns)
+        # 同一文本在各阶段只扫描一次
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, text: str) -> KeywordHits:
+        return KeywordHits(self, frozenset(self._automaton.matches(text.lower())))
+
+    def tweet_hits(self, tweet) -> KeywordHits:
+        """推文正文的命中：标准化时已扫描过的直接复用，否则现扫"""
+        if tweet.keyword_hits is not None:
+            return KeywordHits(self, tweet.keyword_hits)
+        return self.scan(tweet.text)
+
+
+@lru_cache(maxsize=None)
+def get_matcher() -> KeywordMatcher:
+    """进程内共享的匹配器，首次调用时编译"""
+    return KeywordMatcher(KEYWORD_TABLES)
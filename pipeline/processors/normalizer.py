@@ -1,41 +1,139 @@
 """标准化处理器：将各数据源原始数据转换为统一模型"""
 
+import os
 import re
 import hashlib
-from datetime import datetime
-from typing import Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional
 
 from dateutil import parser as dateparser
 
 from pipeline.models.schemas import Tweet, Repo, Quest, MarketSignal
+from pipeline.processors.keywords import TWEET_TAG_KEYWORDS, KeywordHits, get_matcher
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1
+)}
+
+
+def _parse_iso(text: str) -> datetime:
+    """GitHub API / HN / SocialData：2024-01-15T10:20:30Z、2024-01-15T10:20:30.000Z"""
+    return datetime.fromisoformat(text)
+
+
+def _parse_twitter(text: str) -> datetime:
+    """Twitter created_at：Wed Oct 10 20:19:24 +0000 2018"""
+    _, month, day, clock, offset, year = text.split(" ")
+    hour, minute, second = clock.split(":")
+    sign = -1 if offset[0] == "-" else 1
+    tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+    return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=tz)
+
+
+# 10 位秒（可带小数）或 13 位毫秒；其它长度的纯数字（如 20240115）交给后面的格式
+_EPOCH_RE = re.compile(r"\d{10}(?:\.\d+)?|(\d{13})")
+
+
+def _parse_epoch(text: str) -> datetime:
+    """Unix 时间戳（秒或毫秒）"""
+    match = _EPOCH_RE.fullmatch(text)
+    if not match:
+        raise ValueError(text)
+    ts = float(text)
+    if match.group(1):
+        ts /= 1000
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+# 按顺序尝试的已知格式；dateutil 只在全部失败时兜底
+_TIME_PARSERS = {
+    "epoch": _parse_epoch,
+    "iso": _parse_iso,
+    "twitter": _parse_twitter,
+}
+
+_SHAPE_TABLE = str.maketrans("0123456789", "0000000000")
+
+
+def _time_shape(text: str) -> str:
+    """格式指纹：数字归一，同一来源的时间串指纹相同"""
+    return text.translate(_SHAPE_TABLE)
 
 
 class Normalizer:
 
+    # 推文数达到该阈值时自动切到多进程批量模式
+    BATCH_THRESHOLD = 5000
+
+    def __init__(self, batch_threshold: int | None = None, workers: int | None = None):
+        self.matcher = get_matcher()
+        self.batch_threshold = batch_threshold or self.BATCH_THRESHOLD
+        self.workers = workers
+        # 时间串指纹 → 命中的解析器名
+        self._time_formats: dict[str, str] = {}
+        # 各解析路径计数：epoch / iso / twitter / dateutil / missing / failed
+        self.time_stats: Counter = Counter()
+
     def normalize_tweets(self, raw_tweets: list[dict]) -> list[Tweet]:
-        results = []
+        if len(raw_tweets) >= self.batch_threshold:
+            return self.normalize_tweets_batch(raw_tweets)
+        return list(self.iter_tweets(raw_tweets))
+
+    def iter_tweets(self, raw_tweets: Iterable[dict]) -> Iterator[Tweet]:
+        """逐条标准化，不持有原始数据"""
         for raw in raw_tweets:
-            try:
-                tweet = Tweet(
-                    id=raw.get("id") or self._generate_id(raw),
-                    author_name=raw.get("author_name", "Unknown"),
-                    author_handle=raw.get("author_handle", "@unknown"),
-                    text=self._clean_text(raw.get("text", "")),
-                    lang=self._detect_lang(raw.get("text", "")),
-                    created_at=self._parse_time(raw.get("created_at")),
-                    likes=int(raw.get("likes", 0)),
-                    reposts=int(raw.get("reposts", 0)),
-                    replies=int(raw.get("replies", 0)),
-                    bookmarks=int(raw.get("bookmarks", 0)),
-                    urls=self._extract_urls(raw.get("text", "")),
-                    tags=self._classify_tags(raw.get("text", "")),
-                    is_ad_suspect=self._detect_ad(raw.get("text", "")),
-                )
-                results.append(tweet)
-            except Exception as e:
-                print(f"[Normalizer] Skip tweet: {e}")
+            tweet = self.normalize_tweet(raw)
+            if tweet is not None:
+                yield tweet
+
+    def normalize_tweets_batch(self, raw_tweets: list[dict], chunk_size: int = 1000) -> list[Tweet]:
+        """按块分发到进程池标准化，输出与逐条处理一致（顺序不变）
+
+        只把用到的字段传给子进程，减少序列化开销；各子进程的时间解析计数汇总回 time_stats。
+        """
+        slim = [{k: raw[k] for k in _TWEET_FIELDS if k in raw} for raw in raw_tweets]
+        chunks = [slim[i:i + chunk_size] for i in range(0, len(slim), chunk_size)]
+        workers = self.workers or os.cpu_count() or 1
+        if len(chunks) <= 1 or workers <= 1:
+            tweets, stats = _normalize_chunk(slim)
+            self.time_stats.update(stats)
+            return tweets
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for tweets, stats in pool.map(_normalize_chunk, chunks):
+                results.extend(tweets)
+                self.time_stats.update(stats)
         return results
 
+    def normalize_tweet(self, raw: dict) -> Tweet | None:
+        try:
+            text = self._clean_text(raw.get("text", ""))
+            urls = self._extract_urls(raw.get("text", ""))
+            # 关键词在清洗后的正文上扫描一次，命中随 Tweet 传给聚类 / 排序复用
+            hits = self.matcher.scan(text)
+            return Tweet(
+                id=raw.get("id") or self._generate_id(raw),
+                author_name=raw.get("author_name", "Unknown"),
+                author_handle=raw.get("author_handle", "@unknown"),
+                text=text,
+                lang=self._detect_lang(raw.get("text", "")),
+                created_at=self._parse_time(raw.get("created_at")),
+                likes=int(raw.get("likes", 0)),
+                reposts=int(raw.get("reposts", 0)),
+                replies=int(raw.get("replies", 0)),
+                bookmarks=int(raw.get("bookmarks", 0)),
+                urls=urls,
+                tags=self._classify_tags(hits, urls),
+                is_ad_suspect=self._detect_ad(hits, urls),
+                keyword_hits=hits.patterns,
+            )
+        except Exception as e:
+            print(f"[Normalizer] Skip tweet: {e}")
+            return None
+
     def normalize_repos(self, raw_repos: list[dict]) -> list[Repo]:
         results = []
         for raw in raw_repos:
@@ -61,6 +159,7 @@ class Normalizer:
                     trend_status=raw.get("trend_status", "new"),
                     watchers=int(raw.get("watchers", 0)),
                     open_issues=int(raw.get("open_issues", 0)),
+                    trending_pages=raw.get("trending_pages", []),
                 )
                 results.append(repo)
             except Exception as e:
@@ -110,60 +209,77 @@ class Normalizer:
         return "zh" if chinese_chars / max(len(text), 1) > 0.3 else "en"
 
     def _parse_time(self, raw_time) -> datetime:
-        if raw_time is None:
-            return datetime.now()
+        """已知格式走快速路径，按格式指纹缓存命中的解析器；dateutil 兜底，全部失败回退当前时间"""
         if isinstance(raw_time, datetime):
             return raw_time
+        if isinstance(raw_time, (int, float)) and not isinstance(raw_time, bool):
+            raw_time = str(raw_time)
+        if not raw_time:
+            self.time_stats["missing"] += 1
+            return datetime.now()
+
+        text = str(raw_time).strip()
+        shape = _time_shape(text)
+        cached = self._time_formats.get(shape)
+        names = [cached] if cached else []
+        names += [name for name in _TIME_PARSERS if name != cached]
+        for name in names:
+            try:
+                parsed = _TIME_PARSERS[name](text)
+            except (ValueError, KeyError, IndexError, OverflowError, OSError):
+                continue
+            if len(self._time_formats) < 256:
+                self._time_formats[shape] = name
+            self.time_stats[name] += 1
+            return parsed
+
         try:
-            return dateparser.parse(str(raw_time))
+            parsed = dateparser.parse(text)
+            self.time_stats["dateutil"] += 1
+            return parsed
         except Exception:
+            self.time_stats["failed"] += 1
             return datetime.now()
 
     def _extract_urls(self, text: str) -> list[str]:
         return re.findall(r"https?://[^\s)<>\"]+", text)
 
-    def _classify_tags(self, text: str) -> list[str]:
-        tags = []
-        t = text.lower()
-        if any(w in t for w in ["released", "launched", "发布", "上线", "announcing"]):
-            tags.append("发布")
-        if any(w in t for w in ["tutorial", "教程", "how to", "guide", "step by step"]):
-            tags.append("教程")
-        if "github.com" in t:
-            tags.append("repo")
-        if any(w in t for w in ["demo", "演示", "showcase", "built with"]):
-            tags.append("demo")
-        if any(w in t for w in ["opinion", "观点", "i think", "hot take", "我认为"]):
-            tags.append("观点")
-        if any(w in t for w in ["update", "更新", "v0.", "v1.", "v2.", "changelog"]):
-            tags.append("工具更新")
-        if any(w in t for w in ["model", "模型", "gpt", "claude", "gemini", "llama"]):
-            tags.append("模型更新")
+    def _classify_tags(self, hits: KeywordHits, urls: list[str]) -> list[str]:
+        found = set(hits.labels("tweet_tags"))
+        # 正文里的链接已移到 urls，github 链接在这里补判
+        if any("github.com" in u.lower() for u in urls):
+            found.add("repo")
+        tags = [tag for tag in TWEET_TAG_KEYWORDS if tag in found]
         return tags or ["观点"]
 
-    def _detect_ad(self, text: str) -> bool:
-        ad_signals = [
-            "referral", "promo code", "discount", "合约地址",
-            "airdrop claim", "limited time", "返佣",
-            "use my link", "sign up with", "exclusive offer",
-            "free tokens", "whitelist spot",
-        ]
-        t = text.lower()
-        score = sum(1 for s in ad_signals if s in t)
-        return score >= 2
+    def _detect_ad(self, hits: KeywordHits, urls: list[str]) -> bool:
+        signals = hits.keywords("ad_signals")
+        # 推广信号常在链接里（?referral=...），链接已从正文移出，单独扫一遍补上
+        if urls:
+            signals = signals | self.matcher.scan(" ".join(urls)).keywords("ad_signals")
+        return len(signals) >= 2
 
     def _tag_repo(self, raw: dict) -> list[str]:
-        tags = []
-        desc = (raw.get("description", "") + " " + " ".join(raw.get("topics", []))).lower()
-        tag_map = {
-            "coding agent": ["agent", "coding agent", "agentic"],
-            "IDE": ["ide", "editor", "copilot", "cursor"],
-            "workflow": ["workflow", "automation", "ci/cd", "pipeline"],
-            "eval": ["eval", "benchmark", "leaderboard"],
-            "RAG": ["rag", "retrieval", "embedding", "vector"],
-            "tooling": ["tool", "framework", "library", "sdk", "infra"],
-        }
-        for tag, keywords in tag_map.items():
-            if any(kw in desc for kw in keywords):
-                tags.append(tag)
+        desc = raw.get("description", "") + " " + " ".join(raw.get("topics", []))
+        tags = self.matcher.scan(desc).labels("repo_tags")
         return tags or ["tooling"]
+
+
+# 标准化推文用到的原始字段，批量模式只传这些给子进程
+_TWEET_FIELDS = (
+    "id", "author_name", "author_handle", "text", "created_at",
+    "likes", "reposts", "replies", "bookmarks",
+)
+
+_worker_normalizer: Normalizer | None = None
+
+
+def _normalize_chunk(chunk: list[dict]) -> tuple[list[Tweet], Counter]:
+    """子进程入口：每个进程复用一个 Normalizer（关键词自动机只编译一次）"""
+    global _worker_normalizer
+    if _worker_normalizer is None:
+        _worker_normalizer = Normalizer()
+    normalizer = _worker_normalizer
+    normalizer.time_stats = Counter()
+    tweets = [t for t in map(normalizer.normalize_tweet, chunk) if t is not None]
+    return tweets, normalizer.time_stats
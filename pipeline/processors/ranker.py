@@ -1,21 +1,9 @@
 """热度排序"""
 
 from pipeline.models.schemas import Tweet, EventCluster
+from pipeline.processors.keywords import get_matcher
 
 
-# 大厂关键词 — 命中则加权
-BIG_LAB_KEYWORDS = [
-    "openai", "gpt-5", "gpt-4o", "o1", "o3", "o4",
-    "anthropic", "claude", "sonnet", "opus",
-    "google", "gemini", "deepmind",
-    "meta", "llama",
-    "mistral",
-    "deepseek",
-    "xai", "grok",
-    "sora", "dall-e",
-    "sam altman", "dario amodei", "demis hassabis",
-]
-
 # 大厂官方账号
 BIG_LAB_HANDLES = {
     "@openai", "@anthropicai", "@googledeepmind", "@googleai",
@@ -33,6 +21,7 @@ class Ranker:
         self.w_discuss = w_discuss
         self.w_dev = w_dev
         self.w_ad_penalty = w_ad_penalty
+        self.matcher = get_matcher()
 
     def rank_tweets(self, tweets: list[Tweet], clusters: list[EventCluster]) -> list[Tweet]:
         # 构建 cluster 作者数映射
@@ -82,14 +71,13 @@ class Ranker:
         """大厂内容加权倍率"""
         boost = 0.0
         handle_lower = tweet.author_handle.lower()
-        text_lower = tweet.text.lower()
 
         # 官方账号发的 → +80%
         if handle_lower in BIG_LAB_HANDLES:
             boost += 0.8
 
         # 内容命中大厂关键词 → +30%
-        matched = sum(1 for kw in BIG_LAB_KEYWORDS if kw in text_lower)
+        matched = self.matcher.tweet_hits(tweet).count("big_lab")
         if matched >= 2:
             boost += 0.5  # 命中多个关键词，更可能是重大更新
         elif matched == 1:
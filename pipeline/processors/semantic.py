@@ -0,0 +1,103 @@
+"""TF-IDF 语义聚类：稀疏 TF-IDF 向量 → 余弦相似度阈值近邻图 → 连通分量
+
+依赖 scipy；未安装时构造 TfidfGrouper 即抛 ImportError，不静默退回链接 / 实体聚类。
+"""
+
+import numpy as np
+
+from pipeline.processors.dedup import tokenize
+
+
+def _scipy_available() -> bool:
+    try:
+        import scipy.sparse  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class TfidfGrouper:
+    """按文本相似度把推文连成组
+
+    threshold: 余弦相似度阈值；top_k: 每条推文最多保留的近邻数；
+    max_df: 文档频率超过该比例的词不参与相似度（近似停用词）。
+    """
+
+    def __init__(self, threshold: float = 0.5, top_k: int = 10, max_df: float = 0.5, chunk_size: int = 2048):
+        self.threshold = threshold
+        self.top_k = top_k
+        self.max_df = max_df
+        self.chunk_size = chunk_size
+        if not _scipy_available():
+            raise ImportError("scipy is required for TF-IDF clustering (pip install scipy)")
+
+    def components(self, texts: list[str]) -> np.ndarray:
+        """每条文本的连通分量编号"""
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        n = len(texts)
+        if n == 0:
+            return np.empty(0, dtype=np.int32)
+        matrix = self._tfidf(texts)
+        rows, cols = self._neighbours(matrix)
+        graph = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        return labels
+
+    def _tfidf(self, texts: list[str]):
+        """行 L2 归一化的 TF-IDF 稀疏矩阵（次线性 tf）"""
+        from scipy.sparse import csr_matrix
+
+        vocab: dict[str, int] = {}
+        indices = []
+        indptr = [0]
+        for text in texts:
+            for token in tokenize(text):
+                indices.append(vocab.setdefault(token, len(vocab)))
+            indptr.append(len(indices))
+
+        n = len(texts)
+        matrix = csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(n, len(vocab)),
+        )
+        matrix.sum_duplicates()
+        matrix.data = 1 + np.log(matrix.data)
+
+        df = np.bincount(matrix.indices, minlength=len(vocab))
+        idf = np.log((1 + n) / (1 + df)) + 1
+        # 只出现一次的词不贡献相似度，过于常见的词视为停用词
+        idf[(df < 2) | (df > max(self.max_df * n, 2))] = 0
+        matrix.data *= idf[matrix.indices].astype(np.float32)
+        matrix.eliminate_zeros()
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr)).astype(np.float32)
+        return matrix
+
+    def _neighbours(self, matrix) -> tuple[np.ndarray, np.ndarray]:
+        """分块计算 X·Xᵀ，保留相似度 ≥ threshold 的 top_k 近邻边"""
+        transposed = matrix.T.tocsr()
+        rows_out, cols_out = [], []
+        for start in range(0, matrix.shape[0], self.chunk_size):
+            sims = (matrix[start:start + self.chunk_size] @ transposed).tocsr()
+            sims.data[sims.data < self.threshold] = 0
+            sims.eliminate_zeros()
+
+            counts = np.diff(sims.indptr)
+            rows = np.repeat(np.arange(start, start + sims.shape[0]), counts)
+            cols = sims.indices
+            keep = rows != cols
+            # 近邻过多的行只保留相似度最高的 top_k 条
+            for r in np.flatnonzero(counts > self.top_k + 1):
+                lo, hi = sims.indptr[r], sims.indptr[r + 1]
+                weakest = lo + np.argsort(sims.data[lo:hi])[:-(self.top_k + 1)]
+                keep[weakest] = False
+            rows_out.append(rows[keep])
+            cols_out.append(cols[keep])
+
+        if not rows_out:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(rows_out), np.concatenate(cols_out)
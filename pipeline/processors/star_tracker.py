@@ -72,9 +72,10 @@ class StarTracker:
                 "stars_24h": stars_24h,
             }
 
-    def cleanup_old(self):
+    def cleanup_old(self, today: str | None = None):
         """清理超过 MAX_HISTORY_DAYS 的旧数据"""
-        cutoff = (datetime.now() - timedelta(days=MAX_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        today = datetime.strptime(today, "%Y-%m-%d") if today else datetime.now()
+        cutoff = (today - timedelta(days=MAX_HISTORY_DAYS)).strftime("%Y-%m-%d")
         for name in list(self.history.keys()):
             dates = self.history[name]
             old_keys = [d for d in dates if d < cutoff]
@@ -0,0 +1,96 @@
+"""推文流式处理：采集 → 标准化 → 去重 边到边处理（去重按小批批量算指纹）
+
+    deduplicator = Deduplicator(CrossDayIndex(Path(data_dir) / "dedup", date_str))
+    async for tweet in stream_tweets(collector.stream(date_range), normalizer, deduplicator):
+        ...
+    deduplicator.history.save()
+
+    store = ClusterStore(data_dir, date_str)
+    clusters = Clusterer(store=store).cluster_events(tweets)
+    store.save()
+
+内存只取决于各阶段必须保留的状态（去重的 URL 集合 / 指纹），与原始数据量无关。
+"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator
+
+from pipeline.models.schemas import Tweet
+from pipeline.processors.dedup import Deduplicator
+from pipeline.processors.normalizer import Normalizer
+
+
+_END = object()
+
+
+async def stream_tweets(
+    raw_tweets: AsyncIterable[dict],
+    normalizer: Normalizer,
+    deduplicator: Deduplicator,
+    max_delay: float = 0.5,
+) -> AsyncIterator[Tweet]:
+    """逐条标准化，攒成小批后批量算指纹去重（同 Deduplicator.iter_dedup）
+
+    上游由单独的任务读入有界队列。攒够 deduplicator.BATCH_SIZE 条，
+    或队列已空且 max_delay 秒内没有新数据时即处理当前这批，上游慢（如等下一页）时不会卡住下游。
+    """
+    deduplicator.reset()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=deduplicator.BATCH_SIZE)
+    error: Exception | None = None
+
+    async def pump():
+        nonlocal error
+        source = aiter(raw_tweets)
+        try:
+            async for raw in source:
+                await queue.put(raw)
+        except Exception as e:
+            error = e
+        finally:
+            # 下游提前停止时关闭上游，让采集端有机会中止远端任务
+            if hasattr(source, "aclose"):
+                await source.aclose()
+        await queue.put(_END)
+
+    producer = asyncio.create_task(pump())
+    batch: list[Tweet] = []
+    try:
+        while True:
+            if batch and queue.empty():
+                try:
+                    raw = await asyncio.wait_for(queue.get(), max_delay)
+                except asyncio.TimeoutError:
+                    for tweet in deduplicator.accept_batch(batch):
+                        yield tweet
+                    batch = []
+                    continue
+            else:
+                raw = await queue.get()
+            if raw is _END:
+                break
+
+            tweet = normalizer.normalize_tweet(raw)
+            if tweet is not None:
+                batch.append(tweet)
+            if len(batch) >= deduplicator.BATCH_SIZE:
+                for tweet in deduplicator.accept_batch(batch):
+                    yield tweet
+                batch = []
+
+        # 上游出错：先交出已收到的部分，再抛出
+        for tweet in deduplicator.accept_batch(batch):
+            yield tweet
+        if error is not None:
+            raise error
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def collect_tweets(
+    raw_tweets: AsyncIterable[dict],
+    normalizer: Normalizer,
+    deduplicator: Deduplicator,
+) -> list[Tweet]:
+    """消费整条流，返回去重后的标准化推文（供聚类 / 排序）"""
+    return [tweet async for tweet in stream_tweets(raw_tweets, normalizer, deduplicator)]
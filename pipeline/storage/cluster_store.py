@@ -0,0 +1,141 @@
+"""跨天事件簇存储：稳定 ID + 关键词 / 外链签名，新一天的推文组增量归入已有事件"""
+
+import json
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pipeline.models.schemas import EventCluster
+
+logger = logging.getLogger(__name__)
+
+
+class ClusterStore:
+    """持久化事件簇 data/clusters.json
+
+    { "evt_20260301_000": {
+        "title", "theme", "first_seen", "last_seen",
+        "terms": {词: 权重},      # 关键词质心（L2 归一化）
+        "urls": [...],            # 标准化外链
+        "daily_heat": {日期: 当日热度}
+    } }
+
+    匹配：共享外链直接命中；否则按关键词质心余弦相似度，≥ MATCH_THRESHOLD 视为同一事件。
+    候选只从倒排索引（外链 / 关键词 → 簇）中取，不遍历全部历史簇。
+    """
+
+    MATCH_THRESHOLD = 0.35
+    SIGNATURE_SIZE = 30  # 质心保留的关键词数
+    MAX_URLS = 100
+    WINDOW_DAYS = 7  # 超过该天数未出现的事件过期
+
+    def __init__(self, data_dir: str | Path, today: str):
+        self.path = Path(data_dir) / "clusters.json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.today = today
+        self.clusters: dict[str, dict] = self._load()
+        self._claimed: set[str] = set()
+        self._build_index()
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            clusters = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Failed to load clusters.json: {e}")
+            return {}
+        oldest = (datetime.strptime(self.today, "%Y-%m-%d") - timedelta(days=self.WINDOW_DAYS)).strftime("%Y-%m-%d")
+        return {cid: c for cid, c in clusters.items() if c.get("last_seen", "") >= oldest}
+
+    def save(self):
+        self.path.write_text(json.dumps(self.clusters, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def _build_index(self):
+        self._by_url: dict[str, set[str]] = defaultdict(set)
+        self._by_term: dict[str, set[str]] = defaultdict(set)
+        for cid, cluster in self.clusters.items():
+            self._index(cid, cluster)
+
+    def _index(self, cid: str, cluster: dict):
+        for url in cluster.get("urls", []):
+            self._by_url[url].add(cid)
+        for term in cluster.get("terms", {}):
+            self._by_term[term].add(cid)
+
+    def assign(self, signatures: list[tuple[dict[str, float], set[str]]]) -> list[str]:
+        """为今天的各推文组分配事件 ID：先按共享外链匹配，再按关键词质心匹配，都不中则新建
+
+        同一天内一个事件只分给一个推文组。
+        """
+        ids: list[str | None] = [None] * len(signatures)
+
+        for i, (_, urls) in enumerate(signatures):
+            for url in sorted(urls):
+                cid = next((c for c in sorted(self._by_url.get(url, ())) if c not in self._claimed), None)
+                if cid:
+                    ids[i] = cid
+                    self._claimed.add(cid)
+                    break
+
+        for i, (terms, _) in enumerate(signatures):
+            if ids[i] is not None:
+                continue
+            terms = _normalize(terms)
+            candidates = set().union(*(self._by_term.get(t, set()) for t in terms)) - self._claimed
+            best_id, best_score = None, self.MATCH_THRESHOLD
+            for cid in sorted(candidates):
+                score = _cosine(terms, self.clusters[cid]["terms"])
+                if score >= best_score:
+                    best_id, best_score = cid, score
+            ids[i] = best_id or self._new_id()
+            self._claimed.add(ids[i])
+
+        return ids
+
+    def _new_id(self) -> str:
+        prefix = f"evt_{self.today.replace('-', '')}_"
+        n = sum(1 for cid in self.clusters if cid.startswith(prefix))
+        while f"{prefix}{n:03d}" in self.clusters or f"{prefix}{n:03d}" in self._claimed:
+            n += 1
+        return f"{prefix}{n:03d}"
+
+    def update(self, cluster: EventCluster, terms: dict[str, float], urls: set[str]):
+        """把今天的推文组并入事件：质心加权融合、外链合并、累计热度
+
+        daily_heat 按日期覆盖，同一天重复运行不会重复累计。
+        """
+        entry = self.clusters.get(cluster.id)
+        if entry is None:
+            entry = {"first_seen": self.today, "terms": {}, "urls": [], "daily_heat": {}}
+            self.clusters[cluster.id] = entry
+
+        old, new = entry["terms"], _normalize(terms)
+        merged = {t: old.get(t, 0.0) * 0.5 + new.get(t, 0.0) * 0.5 for t in old.keys() | new.keys()} if old else new
+        top = sorted(merged.items(), key=lambda kv: kv[1], reverse=True)[:self.SIGNATURE_SIZE]
+        entry["terms"] = {t: round(w, 4) for t, w in _normalize(dict(top)).items()}
+        entry["urls"] = (sorted(urls) + [u for u in entry["urls"] if u not in urls])[:self.MAX_URLS]
+        entry["daily_heat"][self.today] = cluster.heat_score
+        entry["last_seen"] = self.today
+        entry["title"] = cluster.title
+        entry["theme"] = cluster.theme
+        self._index(cluster.id, entry)
+
+        cluster.first_seen = entry["first_seen"]
+        cluster.days_active = len(entry["daily_heat"])
+        cluster.total_heat = round(sum(entry["daily_heat"].values()), 1)
+
+
+def _normalize(terms: dict[str, float]) -> dict[str, float]:
+    norm = math.sqrt(sum(w * w for w in terms.values()))
+    if not norm:
+        return {}
+    return {t: w / norm for t, w in terms.items()}
+
+
+def _cosine(a: dict[str, float], b: dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(t, 0.0) for t, w in a.items())
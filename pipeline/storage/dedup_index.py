@@ -0,0 +1,109 @@
+"""跨天去重索引：按天存放已保留推文的 SimHash 指纹 + URL 集合哈希
+
+每天一个定长二进制文件 data/dedup/{date}.bin，记录为 (fp: uint64, urls: uint64)。
+加载时直接 memmap 拼接，不逐条解析；超出窗口的天文件直接删除。
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD = np.dtype([("fp", "<u8"), ("urls", "<u8")])
+
+
+def simhash_bands(threshold: int) -> list[tuple[int, int]]:
+    """把 64 位指纹切成 threshold + 1 段的 (位移, 掩码)，最后一段吃掉除不尽的位"""
+    bands = threshold + 1
+    width = 64 // bands
+    return [
+        (i * width, (1 << (64 - i * width if i == bands - 1 else width)) - 1)
+        for i in range(bands)
+    ]
+
+
+def url_set_hash(urls) -> int:
+    """URL 集合的 64 位哈希（与顺序无关）；空集合为 0"""
+    if not urls:
+        return 0
+    digest = hashlib.blake2b("\n".join(sorted(urls)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class CrossDayIndex:
+    """最近 window_days 天（不含今天）保留过的推文
+
+    今天保留的推文在 save() 时整体覆盖写入今天的文件，同一天重复运行不会自我命中。
+    """
+
+    def __init__(self, root: str | Path, today: str, window_days: int = 7, threshold: int = 3):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.today = today
+        self.window_days = window_days
+        self.threshold = threshold
+        self._bands = simhash_bands(threshold)
+        self._pending: list[tuple[int, int]] = []
+        self._load()
+
+    def _load(self):
+        today = datetime.strptime(self.today, "%Y-%m-%d")
+        oldest = (today - timedelta(days=self.window_days)).strftime("%Y-%m-%d")
+
+        arrays = []
+        for path in sorted(self.root.glob("*.bin")):
+            date = path.stem
+            if date < oldest:
+                path.unlink()
+                continue
+            if date >= self.today or path.stat().st_size < RECORD.itemsize:
+                continue
+            arrays.append(np.memmap(path, dtype=RECORD, mode="r"))
+
+        records = np.concatenate(arrays) if arrays else np.empty(0, dtype=RECORD)
+        self.size = len(records)
+
+        urls = records["urls"]
+        self._urls = np.unique(urls[urls != 0])
+
+        # 每段按段值排序，查询时二分取同段候选；16 位段值用 stable（基数）排序，线性时间
+        fps = records["fp"]
+        self._band_keys = []
+        self._band_fps = []
+        for shift, mask in self._bands:
+            keys = (fps >> np.uint64(shift)) & np.uint64(mask)
+            if mask <= 0xFFFF:
+                keys = keys.astype(np.uint16)
+            order = np.argsort(keys, kind="stable")
+            self._band_keys.append(keys[order])
+            self._band_fps.append(fps[order])
+
+        logger.info(f"Cross-day dedup index: {self.size} records from {len(arrays)} days")
+
+    def contains_urls(self, urls_hash: int) -> bool:
+        if not urls_hash or not len(self._urls):
+            return False
+        i = np.searchsorted(self._urls, np.uint64(urls_hash))
+        return bool(i < len(self._urls) and self._urls[i] == urls_hash)
+
+    def contains_near(self, fingerprint: int) -> bool:
+        for (shift, mask), keys, fps in zip(self._bands, self._band_keys, self._band_fps):
+            key = keys.dtype.type((fingerprint >> shift) & mask)
+            lo = np.searchsorted(keys, key, side="left")
+            hi = np.searchsorted(keys, key, side="right")
+            for candidate in fps[lo:hi].tolist():
+                if (candidate ^ fingerprint).bit_count() <= self.threshold:
+                    return True
+        return False
+
+    def add(self, fingerprint: int, urls_hash: int):
+        self._pending.append((fingerprint, urls_hash))
+
+    def save(self):
+        path = self.root / f"{self.today}.bin"
+        np.array(self._pending, dtype=RECORD).tofile(path)
+        logger.info(f"Cross-day dedup index: wrote {len(self._pending)} records to {path}")
@@ -0,0 +1,72 @@
+"""Polymarket 价格时间序列：按 slug 追加写入，按 (slug, ts) 索引查询历史价格"""
+
+import sqlite3
+import time
+
+DAY = 86400
+
+
+class OddsStore:
+    """每次运行写入各市场当前价格（首个 outcome，如 Yes）；odds 变化直接按索引查历史价格
+
+    (slug, ts) 为主键且 WITHOUT ROWID，表按主键聚簇存储，查某市场某时刻的价格只需一次索引定位。
+    """
+
+    # 查询 N 天前价格时允许的时间误差：每日运行时间会有漂移
+    TOLERANCE = 3 * 3600
+
+    def __init__(self, db_path: str = "polymarket_odds.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self._init_tables()
+
+    def _init_tables(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS market_odds (
+                slug TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                price REAL NOT NULL,
+                PRIMARY KEY (slug, ts)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def record(self, prices: dict[str, float], ts: int | None = None):
+        ts = ts or int(time.time())
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO market_odds (slug, ts, price) VALUES (?, ?, ?)",
+            [(slug, ts, price) for slug, price in prices.items()],
+        )
+        self.conn.commit()
+
+    def price_at(self, slug: str, ts: int, max_age: int) -> float | None:
+        """不晚于 ts（含误差）的最近一次价格；比 ts 早超过 max_age 视为无数据"""
+        row = self.conn.execute(
+            """
+            SELECT price FROM market_odds
+            WHERE slug = ? AND ts <= ? AND ts >= ?
+            ORDER BY ts DESC LIMIT 1
+            """,
+            (slug, ts + self.TOLERANCE, ts - max_age),
+        ).fetchone()
+        return row[0] if row else None
+
+    def change(self, slug: str, price: float, days: int, now: int | None = None) -> float | None:
+        """days 天内的价格变化（百分点）"""
+        now = now or int(time.time())
+        past = self.price_at(slug, now - days * DAY, max_age=max(DAY // 2, days * DAY // 4))
+        if past is None:
+            return None
+        return round((price - past) * 100, 1)
+
+    def format_change(self, slug: str, price: float, now: int | None = None) -> str | None:
+        """如 "+5.2pt (1d) / -3.0pt (7d)"；无历史返回 None"""
+        parts = []
+        for days in (1, 7):
+            delta = self.change(slug, price, days, now)
+            if delta is not None:
+                parts.append(f"{delta:+.1f}pt ({days}d)")
+        return " / ".join(parts) or None
+
+    def close(self):
+        self.conn.close()
@@ -24,6 +24,9 @@ QWEN_API_KEY = os.getenv("QWEN_API_KEY", os.getenv("DASHSCOPE_API_KEY", "")).str
 QWEN_BASE_URL = os.getenv("QWEN_BASE_URL", "https://dashscope.aliyuncs.com/compatible-mode/v1").rstrip("/")
 QWEN_MODEL = os.getenv("QWEN_MODEL", "qwen3-max-2026-01-23")
 
+# 复用连接：多条文案共用 TLS 连接，不必每次重新握手
+SESSION = requests.Session()
+
 
 # =============================
 # Excel 读取（用 openpyxl，不依赖 pandas）
@@ -180,7 +183,7 @@ def qwen_polish(text: str, style_index: int = 0) -> str:
         "temperature": 0.7
     }
 
-    r = requests.post(url, headers=headers, json=payload, timeout=60)
+    r = SESSION.post(url, headers=headers, json=payload, timeout=60)
     r.raise_for_status()
     return r.json()["choices"][0]["message"]["content"].strip()
 
@@ -196,7 +199,7 @@ def telegram_send_text(msg: str):
 
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {"chat_id": TELEGRAM_CHAT_ID, "text": msg}
-    r = requests.post(url, json=payload, timeout=30)
+    r = SESSION.post(url, json=payload, timeout=30)
     r.raise_for_status()
 
 